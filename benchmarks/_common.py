@@ -0,0 +1,86 @@
+"""Timing and allocation helpers shared by the benchmark scripts."""
+import json
+import statistics
+import time
+import tracemalloc
+
+from hyperliquid.utils.types import Any, Callable, Dict, List, NamedTuple, Optional
+
+StageResult = NamedTuple(
+    "StageResult",
+    [
+        ("name", str),
+        ("p50_us", float),
+        ("p90_us", float),
+        ("p99_us", float),
+        ("mean_us", float),
+        ("peak_alloc_bytes", int),
+    ],
+)
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def peak_allocation(fn: Callable[[], Any]) -> int:
+    """Bytes allocated at the peak of a single call, measured separately since tracing slows the timed runs."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - before)
+
+
+def measure(name: str, fn: Callable[[], Any], iterations: int, warmup: int = 10) -> StageResult:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    samples.sort()
+    return StageResult(
+        name,
+        percentile(samples, 0.5),
+        percentile(samples, 0.9),
+        percentile(samples, 0.99),
+        statistics.fmean(samples),
+        peak_allocation(fn),
+    )
+
+
+def print_results(results: List[StageResult]) -> None:
+    width = max(len(result.name) for result in results)
+    print(f"{'stage':<{width}} {'p50 us':>11} {'p90 us':>11} {'p99 us':>11} {'mean us':>11} {'peak alloc':>11}")
+    for result in results:
+        print(
+            f"{result.name:<{width}} {result.p50_us:11.1f} {result.p90_us:11.1f} {result.p99_us:11.1f}"
+            f" {result.mean_us:11.1f} {result.peak_alloc_bytes / 1024:9.1f}KiB"
+        )
+
+
+def save_results(path: str, results: List[StageResult]) -> None:
+    with open(path, "w") as f:
+        json.dump({result.name: result._asdict() for result in results}, f, indent=2)
+
+
+def compare_results(path: str, results: List[StageResult], threshold: float) -> List[str]:
+    """Return a description of every stage whose p50 grew by more than threshold relative to a saved baseline."""
+    with open(path) as f:
+        baseline: Dict[str, Dict[str, Any]] = json.load(f)
+    regressions = []
+    for result in results:
+        previous: Optional[Dict[str, Any]] = baseline.get(result.name)
+        if previous is None or previous["p50_us"] <= 0:
+            continue
+        ratio = result.p50_us / previous["p50_us"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{result.name}: p50 {previous['p50_us']:.1f}us -> {result.p50_us:.1f}us ({ratio:.2f}x)")
+    return regressions
@@ -0,0 +1,98 @@
+"""Check float_to_wire against the Decimal based reference and time both.
+
+The equivalence sweep walks the tick grid of every possible szDecimals: sizes have szDecimals decimals and prices
+have MAX_DECIMALS - szDecimals decimals (6 for perps, 8 for spot), so every decimal count from 0 to 8 is covered.
+It also checks negative values, large magnitudes, zero, off-grid values that must raise, and non-finite values.
+
+    python -m benchmarks.bench_float_to_wire [--ticks N]
+"""
+import argparse
+import math
+import timeit
+from decimal import Decimal
+
+from hyperliquid.utils import signing
+from hyperliquid.utils.signing import float_to_wire
+
+PERP_MAX_DECIMALS = 6
+SPOT_MAX_DECIMALS = 8
+
+
+def reference_float_to_wire(x: float) -> str:
+    rounded = f"{x:.8f}"
+    if abs(float(rounded) - x) >= 1e-12:
+        raise ValueError("float_to_wire causes rounding", x)
+    if rounded == "-0":
+        rounded = "0"
+    normalized = Decimal(rounded).normalize()
+    return f"{normalized:f}"
+
+
+def outcome(fn, x):
+    try:
+        return fn(x)
+    except ValueError as e:
+        return ("ValueError", e.args)
+
+
+def assert_same(x):
+    signing._float_to_wire_cache.clear()
+    expected = outcome(reference_float_to_wire, x)
+    # Once uncached, once cached
+    for actual in (outcome(float_to_wire, x), outcome(float_to_wire, x)):
+        if not (expected == actual or (x != x and str(expected) == str(actual))):
+            raise AssertionError(f"float_to_wire({x!r}) = {actual!r}, expected {expected!r}")
+
+
+def tick_grid_decimals():
+    decimals = set()
+    for sz_decimals in range(SPOT_MAX_DECIMALS + 1):
+        decimals.add(sz_decimals)
+        decimals.add(max(0, PERP_MAX_DECIMALS - sz_decimals))
+        decimals.add(SPOT_MAX_DECIMALS - sz_decimals)
+    return sorted(decimals)
+
+
+def check_equivalence(ticks):
+    checked = 0
+    for decimals in tick_grid_decimals():
+        scale = 10**decimals
+        for k in range(ticks):
+            x = k / scale
+            # Same values through round(), the way callers usually produce prices and sizes
+            for value in (x, -x, round(k * (1 / scale), decimals)):
+                assert_same(value)
+                checked += 1
+        # Sparse sweep over large magnitudes of the same grid
+        for exponent in range(0, 22):
+            for k in (1, 7, 12345, 99999):
+                x = k * 10**exponent / scale
+                assert_same(x)
+                assert_same(-x)
+                checked += 2
+    for x in (0.0, -0.0, 1e-9, 1.5e-8, 0.1 + 0.2, 1 / 3, 1e28, 1.2345678901234567e25, math.inf, -math.inf, math.nan):
+        assert_same(x)
+        checked += 1
+    return checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=100_000, help="ticks checked per decimal count")
+    args = parser.parse_args()
+
+    checked = check_equivalence(args.ticks)
+    print(f"float_to_wire matches the reference on {checked} values")
+
+    number = 200_000
+    prices = [3012.3 + i * 0.1 for i in range(200)]
+    for name, fn in (("reference", reference_float_to_wire), ("float_to_wire", float_to_wire)):
+        signing._float_to_wire_cache.clear()
+        seconds = timeit.timeit(lambda: [fn(px) for px in prices], number=number // len(prices))
+        print(f"{name:<14} {seconds / number * 1e9:8.0f} ns/call (200 distinct prices, repeated)")
+    seconds = timeit.timeit(lambda: signing._float_to_wire(3012.3), number=number)
+    print(f"{'uncached':<14} {seconds / number * 1e9:8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Decode cost of websocket frames with each available JSON codec, and of peeking at them without decoding.
+
+Frames are read from a file with one raw frame per line, as written by --record, or generated: a 20 level l2Book,
+allMids for 300 coins and a webData2 with 50 positions and 100 open orders.
+
+    python -m benchmarks.bench_json_codec [--frames FILE] [--iterations N]
+    python -m benchmarks.bench_json_codec --record FILE [--seconds S] [--coin ETH] [--user 0x...]
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+from benchmarks._common import measure, print_results
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.json_codec import CODECS, STDLIB_CODEC
+from utils.frame_peek import peek_channel, peek_identifier
+
+
+def l2_book_frame():
+    bids = [{"px": f"{3000 - 0.1 * (i + 1):.1f}", "sz": f"{random.uniform(0.1, 50):.4f}", "n": random.randint(1, 20)}
+            for i in range(20)]
+    asks = [{"px": f"{3000 + 0.1 * (i + 1):.1f}", "sz": f"{random.uniform(0.1, 50):.4f}", "n": random.randint(1, 20)}
+            for i in range(20)]
+    return {"channel": "l2Book", "data": {"coin": "ETH", "time": 1700000000000, "levels": [bids, asks]}}
+
+
+def all_mids_frame():
+    return {"channel": "allMids", "data": {"mids": {f"COIN{i}": f"{random.uniform(0.001, 70000):.6g}"
+                                                    for i in range(300)}}}
+
+
+def web_data2_frame():
+    positions = [
+        {
+            "type": "oneWay",
+            "position": {
+                "coin": f"COIN{i}",
+                "szi": f"{random.uniform(-100, 100):.4f}",
+                "leverage": {"type": "cross", "value": 10},
+                "entryPx": f"{random.uniform(1, 3000):.2f}",
+                "positionValue": f"{random.uniform(100, 100000):.2f}",
+                "unrealizedPnl": f"{random.uniform(-1000, 1000):.2f}",
+                "returnOnEquity": f"{random.uniform(-1, 1):.6f}",
+                "liquidationPx": f"{random.uniform(1, 3000):.2f}",
+                "marginUsed": f"{random.uniform(10, 10000):.2f}",
+                "maxLeverage": 50,
+                "cumFunding": {"allTime": "12.5", "sinceOpen": "1.2", "sinceChange": "0.3"},
+            },
+        }
+        for i in range(50)
+    ]
+    open_orders = [
+        {"coin": f"COIN{i % 50}", "side": random.choice("AB"), "limitPx": f"{random.uniform(1, 3000):.2f}",
+         "sz": f"{random.uniform(0.1, 10):.4f}", "oid": 1000000 + i, "timestamp": 1700000000000 + i,
+         "origSz": "10.0", "cloid": None}
+        for i in range(100)
+    ]
+    return {
+        "channel": "webData2",
+        "data": {
+            "user": "0x" + "ab" * 20,
+            "clearinghouseState": {
+                "assetPositions": positions,
+                "marginSummary": {"accountValue": "123456.7", "totalNtlPos": "98765.4", "totalRawUsd": "24691.3",
+                                  "totalMarginUsed": "9876.5"},
+                "withdrawable": "100000.0",
+                "time": 1700000000000,
+            },
+            "openOrders": open_orders,
+            "serverTime": 1700000000000,
+        },
+    }
+
+
+def generated_frames(codec):
+    random.seed(0)
+    frames = []
+    for make in (l2_book_frame, all_mids_frame, web_data2_frame):
+        frames.extend(codec.dumps(make()) for _ in range(20))
+    return frames
+
+
+def load_frames(path):
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+async def record(path, seconds, coin, user):
+    import websockets
+
+    subscriptions = [{"type": "allMids"}, {"type": "l2Book", "coin": coin}, {"type": "trades", "coin": coin}]
+    if user:
+        subscriptions.append({"type": "webData2", "user": user})
+    url = "ws" + MAINNET_API_URL[len("http"):] + "/ws"
+    count = 0
+    deadline = time.monotonic() + seconds
+    async with websockets.connect(url, max_size=None) as ws:
+        for subscription in subscriptions:
+            await ws.send(STDLIB_CODEC.dumps({"method": "subscribe", "subscription": subscription}))
+        with open(path, "w") as f:
+            while time.monotonic() < deadline:
+                try:
+                    frame = await asyncio.wait_for(ws.recv(), deadline - time.monotonic())
+                except asyncio.TimeoutError:
+                    break
+                f.write(frame + "\n")
+                count += 1
+    print(f"recorded {count} frames to {path}")
+
+
+def per_frame(result, frames):
+    """Report timings per frame rather than per batch of frames."""
+    return result._replace(p50_us=result.p50_us / frames, p90_us=result.p90_us / frames,
+                           p99_us=result.p99_us / frames, mean_us=result.mean_us / frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", help="file with one recorded frame per line")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--record", metavar="FILE", help="record mainnet frames to FILE instead of benchmarking")
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--coin", default="ETH")
+    parser.add_argument("--user", help="also record webData2 of this address")
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record, args.seconds, args.coin, args.user))
+        return
+
+    frames = load_frames(args.frames) if args.frames else generated_frames(STDLIB_CODEC)
+    by_channel = defaultdict(list)
+    for frame in frames:
+        by_channel[STDLIB_CODEC.loads(frame).get("channel")].append(frame)
+    print(f"{len(frames)} frames, codecs: {', '.join(CODECS)}")
+
+    results = []
+    for channel, channel_frames in sorted(by_channel.items(), key=lambda item: str(item[0])):
+        size = sum(len(frame) for frame in channel_frames) // len(channel_frames)
+        for name, codec in CODECS.items():
+            def decode(codec=codec, channel_frames=channel_frames):
+                for frame in channel_frames:
+                    codec.loads(frame)
+
+            results.append(per_frame(measure(f"{channel} ({size}B) {name}", decode, args.iterations),
+                                     len(channel_frames)))
+
+        def peek(channel_frames=channel_frames):
+            for frame in channel_frames:
+                peek_identifier(frame, peek_channel(frame))
+
+        results.append(per_frame(measure(f"{channel} ({size}B) peek", peek, args.iterations), len(channel_frames)))
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare sign_l1_action with sign_l1_action_fast.
+
+Checks that both produce byte for byte identical signatures on mainnet and testnet, with and without a vault
+address, then reports signatures per second for each.
+
+    python -m benchmarks.bench_l1_signing [--iterations N]
+"""
+import argparse
+import time
+
+import eth_account
+
+from hyperliquid.utils.signing import (
+    order_request_to_order_wire,
+    order_wires_to_order_action,
+    sign_l1_action,
+    sign_l1_action_fast,
+)
+
+VAULT_ADDRESS = "0x1719884eb866cb12b2287399b15f7db5e7d775ea"
+
+
+def build_action(n_orders):
+    wires = [
+        order_request_to_order_wire(
+            {
+                "coin": "ETH",
+                "is_buy": i % 2 == 0,
+                "sz": 0.01 * (i + 1),
+                "limit_px": 3000.0 + i,
+                "order_type": {"limit": {"tif": "Gtc"}},
+                "reduce_only": False,
+            },
+            1,
+        )
+        for i in range(n_orders)
+    ]
+    return order_wires_to_order_action(wires)
+
+
+def check_equivalence(wallet):
+    action = build_action(3)
+    for is_mainnet in (True, False):
+        for vault_address in (None, VAULT_ADDRESS):
+            for nonce in (0, 1, 1_700_000_000_000, 2**63):
+                expected = sign_l1_action(wallet, action, vault_address, nonce, is_mainnet)
+                actual = sign_l1_action_fast(wallet, action, vault_address, nonce, is_mainnet)
+                if expected != actual:
+                    raise AssertionError(f"signature mismatch: {expected} != {actual}")
+
+
+def signatures_per_second(sign, wallet, action, iterations):
+    start = time.perf_counter()
+    for nonce in range(iterations):
+        sign(wallet, action, None, nonce, True)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    wallet = eth_account.Account.create()
+    check_equivalence(wallet)
+    print("sign_l1_action_fast matches sign_l1_action")
+
+    action = build_action(1)
+    reference = signatures_per_second(sign_l1_action, wallet, action, args.iterations)
+    fast = signatures_per_second(sign_l1_action_fast, wallet, action, args.iterations)
+    print(f"sign_l1_action      {reference:10.0f} sig/s")
+    print(f"sign_l1_action_fast {fast:10.0f} sig/s  ({fast / reference:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Update throughput of the local L2 order book.
+
+Applies synthetic 20 level l2Book payloads to one coin's book, as full snapshots (the Hyperliquid l2Book channel
+format) and as single level diffs, and times the top of book queries.
+
+    python -m benchmarks.bench_order_book [--updates N]
+"""
+import argparse
+import random
+import time
+
+from utils.order_book import L2OrderBook, OrderBookManager
+
+DEPTH = 20
+
+
+def snapshot(mid, tick, t):
+    bids = [{"px": f"{mid - tick * (i + 1):.1f}", "sz": f"{random.uniform(0.1, 5):.4f}", "n": random.randint(1, 9)}
+            for i in range(DEPTH)]
+    asks = [{"px": f"{mid + tick * (i + 1):.1f}", "sz": f"{random.uniform(0.1, 5):.4f}", "n": random.randint(1, 9)}
+            for i in range(DEPTH)]
+    return {"channel": "l2Book", "data": {"coin": "ETH", "time": t, "levels": [bids, asks]}}
+
+
+def rate(count, seconds):
+    return f"{count / seconds:12.0f}/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=50_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    messages = [snapshot(3000 + random.randint(-50, 50) * 0.1, 0.1, t) for t in range(1000)]
+    books = OrderBookManager()
+    start = time.perf_counter()
+    for i in range(args.updates):
+        books.on_message(messages[i % len(messages)])
+    print(f"snapshot replace ({DEPTH}x2 levels) {rate(args.updates, time.perf_counter() - start)}")
+
+    book = L2OrderBook("ETH")
+    book.apply_snapshot(messages[0]["data"])
+    diffs = [("B" if random.random() < 0.5 else "A", round(3000 + random.randint(-30, 30) * 0.1, 1),
+              random.choice([0.0, 0.5, 1.25, 3.0]), 1) for _ in range(1000)]
+    start = time.perf_counter()
+    for i in range(args.updates):
+        side, px, sz, n = diffs[i % len(diffs)]
+        book.apply_level(side, px, sz, n)
+    print(f"single level diff              {rate(args.updates, time.perf_counter() - start)}")
+
+    book.apply_snapshot(messages[0]["data"])
+    start = time.perf_counter()
+    for _ in range(args.updates):
+        book.best_bid()
+        book.best_ask()
+        book.mid()
+        book.spread()
+    print(f"best bid/ask + mid + spread    {rate(args.updates, time.perf_counter() - start)}")
+    start = time.perf_counter()
+    for _ in range(args.updates):
+        book.depth_to_notional("A", 25_000)
+    print(f"depth_to_notional(25k)         {rate(args.updates, time.perf_counter() - start)}")
+
+
+if __name__ == "__main__":
+    main()
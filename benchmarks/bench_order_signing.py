@@ -0,0 +1,173 @@
+"""Offline throughput benchmark of the order signing pipeline.
+
+Times every stage between an OrderRequest and a signed payload (float_to_wire, order_request_to_order_wire,
+action_hash, sign_inner and the full sign_l1_action_fast path) for bulk order payloads of 1, 10, 100 and 1000
+orders, along with cancel, batchModify and usdSend actions. Reports latency percentiles and the peak allocation
+of a single call.
+
+    python -m benchmarks.bench_order_signing [--iterations N] [--save out.json] [--compare baseline.json]
+
+With --compare the script exits non-zero when a stage's p50 regressed by more than --threshold.
+"""
+import argparse
+import sys
+
+import eth_account
+
+from benchmarks._common import compare_results, measure, print_results, save_results
+from hyperliquid.utils.signing import (
+    action_hash,
+    construct_phantom_agent,
+    float_to_wire,
+    order_request_to_order_wire,
+    order_wires_to_order_action,
+    sign_inner,
+    sign_l1_action_fast,
+    sign_usd_transfer_action,
+)
+from hyperliquid.utils.types import Cloid
+
+SIZES = [1, 10, 100, 1000]
+NONCE = 1_700_000_000_000
+DESTINATION = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+
+
+def order_requests(n):
+    return [
+        {
+            "coin": "ETH",
+            "is_buy": i % 2 == 0,
+            "sz": round(0.0123 * (i % 50 + 1), 4),
+            "limit_px": round(3012.3 + (i % 200) * 0.1, 1),
+            "order_type": {"limit": {"tif": "Alo"}} if i % 3 else {"limit": {"tif": "Gtc"}},
+            "reduce_only": False,
+            "cloid": Cloid.from_int(i + 1),
+        }
+        for i in range(n)
+    ]
+
+
+def l1_typed_data(hash):
+    # Same typed data sign_l1_action builds, so sign_inner can be timed on its own
+    return {
+        "domain": {
+            "chainId": 1337,
+            "name": "Exchange",
+            "verifyingContract": "0x0000000000000000000000000000000000000000",
+            "version": "1",
+        },
+        "types": {
+            "Agent": [
+                {"name": "source", "type": "string"},
+                {"name": "connectionId", "type": "bytes32"},
+            ],
+            "EIP712Domain": [
+                {"name": "name", "type": "string"},
+                {"name": "version", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+                {"name": "verifyingContract", "type": "address"},
+            ],
+        },
+        "primaryType": "Agent",
+        "message": construct_phantom_agent(hash, True),
+    }
+
+
+def bench_bulk_orders(wallet, n, iterations):
+    requests = order_requests(n)
+    wires = [order_request_to_order_wire(order, 1) for order in requests]
+    action = order_wires_to_order_action(wires)
+    typed_data = l1_typed_data(action_hash(action, None, NONCE))
+
+    def to_wire_floats():
+        for order in requests:
+            float_to_wire(order["limit_px"])
+            float_to_wire(order["sz"])
+
+    def end_to_end():
+        order_action = order_wires_to_order_action([order_request_to_order_wire(order, 1) for order in requests])
+        sign_l1_action_fast(wallet, order_action, None, NONCE, True)
+
+    prefix = f"order[{n}]"
+    return [
+        measure(f"{prefix} float_to_wire", to_wire_floats, iterations),
+        measure(f"{prefix} order_request_to_order_wire", lambda: [order_request_to_order_wire(o, 1) for o in requests], iterations),
+        measure(f"{prefix} action_hash", lambda: action_hash(action, None, NONCE), iterations),
+        measure(f"{prefix} sign_inner", lambda: sign_inner(wallet, typed_data), iterations),
+        measure(f"{prefix} sign_l1_action_fast", lambda: sign_l1_action_fast(wallet, action, None, NONCE, True), iterations),
+        measure(f"{prefix} total", end_to_end, iterations),
+    ]
+
+
+def bench_cancel(wallet, n, iterations):
+    def end_to_end():
+        cancel_action = {"type": "cancel", "cancels": [{"a": 1, "o": 1_000_000 + i} for i in range(n)]}
+        sign_l1_action_fast(wallet, cancel_action, None, NONCE, True)
+
+    action = {"type": "cancel", "cancels": [{"a": 1, "o": 1_000_000 + i} for i in range(n)]}
+    prefix = f"cancel[{n}]"
+    return [
+        measure(f"{prefix} action_hash", lambda: action_hash(action, None, NONCE), iterations),
+        measure(f"{prefix} total", end_to_end, iterations),
+    ]
+
+
+def bench_batch_modify(wallet, n, iterations):
+    requests = order_requests(n)
+
+    def build():
+        return {
+            "type": "batchModify",
+            "modifies": [
+                {"oid": 1_000_000 + i, "order": order_request_to_order_wire(order, 1)} for i, order in enumerate(requests)
+            ],
+        }
+
+    action = build()
+    prefix = f"batchModify[{n}]"
+    return [
+        measure(f"{prefix} wires", build, iterations),
+        measure(f"{prefix} action_hash", lambda: action_hash(action, None, NONCE), iterations),
+        measure(f"{prefix} total", lambda: sign_l1_action_fast(wallet, build(), None, NONCE, True), iterations),
+    ]
+
+
+def bench_usd_send(wallet, iterations):
+    def end_to_end():
+        action = {"destination": DESTINATION, "amount": "12.5", "time": NONCE, "type": "usdSend"}
+        sign_usd_transfer_action(wallet, action, True)
+
+    return [measure("usdSend total", end_to_end, iterations)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200, help="iterations of the single order case")
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON written by --save")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative p50 regression")
+    args = parser.parse_args()
+
+    wallet = eth_account.Account.create()
+    results = []
+    for n in SIZES:
+        # Keep the runtime of the large payloads bounded
+        iterations = max(10, args.iterations // n)
+        results += bench_bulk_orders(wallet, n, iterations)
+        results += bench_cancel(wallet, n, iterations)
+        results += bench_batch_modify(wallet, n, iterations)
+    results += bench_usd_send(wallet, args.iterations)
+    print_results(results)
+
+    if args.save:
+        save_results(args.save, results)
+    if args.compare:
+        regressions = compare_results(args.compare, results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
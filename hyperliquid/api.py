@@ -1,28 +1,44 @@
-import json
 import logging
-from json import JSONDecodeError
+import threading
 
 import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
 from hyperliquid.utils.constants import MAINNET_API_URL
 from hyperliquid.utils.error import ClientError, ServerError
-from hyperliquid.utils.types import Any
+from hyperliquid.utils.json_codec import JsonCodec, resolve_codec
+from hyperliquid.utils.types import Any, Optional, Union
 
 
 class API:
-    def __init__(self, base_url=None):
+    def __init__(self, base_url=None, codec: Union[None, str, JsonCodec] = None):
         self.base_url = base_url or MAINNET_API_URL
+        self.codec = resolve_codec(codec)
         self.session = requests.Session()
         self.session.headers.update({"Content-Type": "application/json"})
+        self._pool_maxsize = DEFAULT_POOLSIZE
+        self._pool_lock = threading.Lock()
         self._logger = logging.getLogger(__name__)
 
-    def post(self, url_path: str, payload: Any = None) -> Any:
+    def _ensure_pool_size(self, size: int) -> None:
+        """Keep up to size connections per host alive, e.g. for size requests sent from as many threads."""
+        with self._pool_lock:
+            if size <= self._pool_maxsize:
+                return
+            # Connections of the replaced adapter stay usable by requests in flight and are then released
+            adapter = HTTPAdapter(pool_connections=DEFAULT_POOLSIZE, pool_maxsize=size)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+            self._pool_maxsize = size
+
+    def post(self, url_path: str, payload: Any = None, timeout: Optional[float] = None) -> Any:
         payload = payload or {}
         url = self.base_url + url_path
-        response = self.session.post(url, json=payload)
+        response = self.session.post(url, data=self.codec.dumps(payload).encode(), timeout=timeout)
         self._handle_exception(response)
         try:
-            return response.json()
+            # Decode the raw bytes, skipping requests' charset detection and str conversion
+            return self.codec.loads(response.content)
         except ValueError:
             return {"error": f"Could not parse JSON: {response.text}"}
 
@@ -32,8 +48,8 @@ class API:
             return
         if 400 <= status_code < 500:
             try:
-                err = json.loads(response.text)
-            except JSONDecodeError:
+                err = self.codec.loads(response.content)
+            except ValueError:
                 raise ClientError(status_code, None, response.text, None, response.headers)
             if err is None:
                 raise ClientError(status_code, None, response.text, None, response.headers)
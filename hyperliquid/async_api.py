@@ -0,0 +1,65 @@
+import logging
+
+import aiohttp
+
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.error import ClientError, ServerError
+from hyperliquid.utils.json_codec import JsonCodec, resolve_codec
+from hyperliquid.utils.types import Any, Optional, Union
+from utils.http_pool import HyperHttpPool, get_default_pool
+
+
+class AsyncAPI:
+    def __init__(
+        self,
+        base_url=None,
+        pool: Optional[HyperHttpPool] = None,
+        codec: Union[None, str, JsonCodec] = None,
+        pool_options: Optional[dict] = None,
+    ):
+        self.base_url = base_url or MAINNET_API_URL
+        self.codec = resolve_codec(codec)
+        # Only a pool created here is closed with the client, a shared one is closed by its owner
+        self._owns_pool = pool is None and pool_options is not None
+        self.pool = HyperHttpPool(**pool_options) if self._owns_pool else pool or get_default_pool()
+        self._logger = logging.getLogger(__name__)
+
+    async def post(self, url_path: str, payload: Any = None, timeout: Optional[float] = None) -> Any:
+        payload = payload or {}
+        url = self.base_url + url_path
+        session = self.pool.get_session()
+        # Only override the session wide timeout when asked to, aiohttp treats None as "no timeout"
+        kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+        data = self.codec.dumps(payload)
+        async with session.post(url, data=data, headers={"Content-Type": "application/json"}, **kwargs) as response:
+            body = await response.read()
+            self._handle_exception(response.status, body, response.headers)
+        try:
+            return self.codec.loads(body)
+        except ValueError:
+            return {"error": f"Could not parse JSON: {body.decode(errors='replace')}"}
+
+    def _handle_exception(self, status_code, body: bytes, headers):
+        if status_code < 400:
+            return
+        text = body.decode(errors="replace")
+        if 400 <= status_code < 500:
+            try:
+                err = self.codec.loads(body)
+            except ValueError:
+                raise ClientError(status_code, None, text, None, headers)
+            if err is None:
+                raise ClientError(status_code, None, text, None, headers)
+            error_data = err.get("data")
+            raise ClientError(status_code, err["code"], err["msg"], headers, error_data)
+        raise ServerError(status_code, text)
+
+    async def close(self):
+        if self._owns_pool:
+            await self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
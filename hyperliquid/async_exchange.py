@@ -0,0 +1,185 @@
+import secrets
+
+import eth_account
+from eth_account.signers.local import LocalAccount
+
+from hyperliquid.async_api import AsyncAPI
+from hyperliquid.async_info import AsyncInfo
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.signing import sign_agent
+from hyperliquid.utils.types import Any, BuilderInfo, Callable, Cloid, Meta, Optional, SpotMeta, Tuple
+from utils.http_pool import HyperHttpPool
+from utils.market_context import MarketContext
+from utils.nonce_manager import NonceManager, get_nonce_manager
+from utils.order_owners import OrderOwnerRegistry, get_default_registry
+from utils.order_store import OrderStore
+
+
+class AsyncExchange(AsyncAPI, Exchange):
+    """Coroutine counterpart of Exchange.
+
+    Actions are built and signed synchronously when the method is called, only the POST to /exchange is
+    awaited, so every inherited Exchange method returns an awaitable, e.g. ``await exchange.order(...)``.
+    Methods that need extra round trips before signing (market orders, agent approval) are overridden here.
+
+    Build instances with ``await AsyncExchange.create(...)`` so that the universe is loaded without blocking.
+    """
+
+    def __init__(
+        self,
+        wallet: LocalAccount,
+        base_url: Optional[str] = None,
+        meta: Optional[Meta] = None,
+        vault_address: Optional[str] = None,
+        account_address: Optional[str] = None,
+        spot_meta: Optional[SpotMeta] = None,
+        pool: Optional[HyperHttpPool] = None,
+        order_owners: Optional[OrderOwnerRegistry] = None,
+        order_store: Optional[OrderStore] = None,
+        market_context: Optional[MarketContext] = None,
+        nonce_manager: Optional[NonceManager] = None,
+    ):
+        AsyncAPI.__init__(self, base_url, pool)
+        self.wallet = wallet
+        self.vault_address = vault_address
+        self.account_address = account_address
+        self.info = AsyncInfo(base_url, True, meta, spot_meta, pool=pool)
+        self.order_owners = order_owners or get_default_registry()
+        self.order_store = order_store
+        self.market_context = market_context
+        self.nonce_manager = nonce_manager or get_nonce_manager(wallet.address)
+
+    @classmethod
+    async def create(
+        cls,
+        wallet: LocalAccount,
+        base_url: Optional[str] = None,
+        meta: Optional[Meta] = None,
+        vault_address: Optional[str] = None,
+        account_address: Optional[str] = None,
+        spot_meta: Optional[SpotMeta] = None,
+        pool: Optional[HyperHttpPool] = None,
+        order_owners: Optional[OrderOwnerRegistry] = None,
+        order_store: Optional[OrderStore] = None,
+        market_context: Optional[MarketContext] = None,
+        nonce_manager: Optional[NonceManager] = None,
+    ) -> "AsyncExchange":
+        exchange = cls(
+            wallet,
+            base_url,
+            None,
+            vault_address,
+            account_address,
+            None,
+            pool,
+            order_owners,
+            order_store,
+            market_context,
+            nonce_manager,
+        )
+        await exchange.info.load_universe(meta, spot_meta)
+        return exchange
+
+    async def _post_action(self, action, signature, nonce, on_response: Optional[Callable[[Any], None]] = None):
+        response = await Exchange._post_action(self, action, signature, nonce)
+        if on_response is not None:
+            on_response(response)
+        return response
+
+    async def _slippage_price(
+        self,
+        name: str,
+        is_buy: bool,
+        slippage: float,
+        px: Optional[float] = None,
+    ) -> float:
+        coin = self.info.coin_for_name(name)
+        if not px:
+            px = self._local_mid(coin)
+        if not px:
+            # Get midprice
+            px = float((await self.info.all_mids())[coin])
+        return self._apply_slippage(coin, is_buy, slippage, px)
+
+    async def market_open(
+        self,
+        name: str,
+        is_buy: bool,
+        sz: float,
+        px: Optional[float] = None,
+        slippage: float = Exchange.DEFAULT_SLIPPAGE,
+        cloid: Optional[Cloid] = None,
+        builder: Optional[BuilderInfo] = None,
+    ) -> Any:
+        # Get aggressive Market Price
+        px = await self._slippage_price(name, is_buy, slippage, px)
+        # Market Order is an aggressive Limit Order IoC
+        return await self.order(
+            name, is_buy, sz, px, order_type={"limit": {"tif": "Ioc"}}, reduce_only=False, cloid=cloid, builder=builder
+        )
+
+    async def market_close(
+        self,
+        coin: str,
+        sz: Optional[float] = None,
+        px: Optional[float] = None,
+        slippage: float = Exchange.DEFAULT_SLIPPAGE,
+        cloid: Optional[Cloid] = None,
+        builder: Optional[BuilderInfo] = None,
+    ) -> Any:
+        szi = self._local_position(coin)
+        if szi is None:
+            szi = self._position_from_state(await self.info.user_state(self._user_address()), coin)
+        if not szi:
+            return None
+        if not sz:
+            sz = abs(szi)
+        is_buy = True if szi < 0 else False
+        # Get aggressive Market Price
+        px = await self._slippage_price(coin, is_buy, slippage, px)
+        # Market Order is an aggressive Limit Order IoC
+        return await self.order(
+            coin,
+            is_buy,
+            sz,
+            px,
+            order_type={"limit": {"tif": "Ioc"}},
+            reduce_only=True,
+            cloid=cloid,
+            builder=builder,
+        )
+
+    async def cancel_open_orders(
+        self,
+        name: str,
+        is_buy: Optional[bool] = None,
+        min_px: Optional[float] = None,
+        max_px: Optional[float] = None,
+    ) -> Any:
+        response = Exchange.cancel_open_orders(self, name, is_buy, min_px, max_px)
+        return await response if response is not None else None
+
+    async def approve_agent(self, name: Optional[str] = None) -> Tuple[Any, str]:
+        agent_key = "0x" + secrets.token_hex(32)
+        account = eth_account.Account.from_key(agent_key)
+        timestamp = self.nonce_manager.next()
+        is_mainnet = self.base_url == MAINNET_API_URL
+        action = {
+            "type": "approveAgent",
+            "agentAddress": account.address,
+            "agentName": name or "",
+            "nonce": timestamp,
+        }
+        signature = sign_agent(self.wallet, action, is_mainnet)
+        if name is None:
+            del action["agentName"]
+
+        return (
+            await self._post_action(
+                action,
+                signature,
+                timestamp,
+            ),
+            agent_key,
+        )
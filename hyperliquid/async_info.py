@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+from hyperliquid.async_api import AsyncAPI
+from hyperliquid.info import HyperliquidInfo
+from hyperliquid.utils.types import Any, BatchResult, Callable, Dict, List, Meta, Optional, SpotMeta
+from hyperliquid.utils.universe import merge_universe
+from utils.http_pool import HyperHttpPool
+from utils.websocket_pool import ShardPolicy
+
+
+class AsyncInfo(AsyncAPI, HyperliquidInfo):
+    """Coroutine counterpart of HyperliquidInfo.
+
+    Every query method is inherited from HyperliquidInfo. Since ``post`` is a coroutine here, each of them
+    returns an awaitable, e.g. ``await info.user_state(address)``.
+
+    The universe can not be fetched from the constructor, build instances with ``await AsyncInfo.create(...)``
+    or pass both ``meta`` and ``spot_meta``.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        skip_ws: Optional[bool] = False,
+        meta: Optional[Meta] = None,
+        spot_meta: Optional[SpotMeta] = None,
+        on_message_function=None,
+        pool: Optional[HyperHttpPool] = None,
+        ws_connections: int = 1,
+        ws_shard_policy: ShardPolicy = "coin_hash",
+        ws_array_decoding: bool = False,
+        ws_options: Optional[Dict[str, Any]] = None,
+    ):
+        AsyncAPI.__init__(self, base_url, pool)
+        self._init_ws(skip_ws, on_message_function, ws_connections, ws_shard_policy, ws_array_decoding, ws_options)
+        self._init_universe_refresh()
+        self._universe_refresh_task: Optional[asyncio.Task] = None
+        self._universe_timer_task: Optional[asyncio.Task] = None
+        self.coin_to_asset = {}
+        self.name_to_coin = {}
+        if meta is not None and spot_meta is not None:
+            self._set_universe(meta, spot_meta)
+
+    @classmethod
+    async def create(
+        cls,
+        base_url: Optional[str] = None,
+        skip_ws: Optional[bool] = False,
+        meta: Optional[Meta] = None,
+        spot_meta: Optional[SpotMeta] = None,
+        on_message_function=None,
+        pool: Optional[HyperHttpPool] = None,
+        ws_connections: int = 1,
+        ws_shard_policy: ShardPolicy = "coin_hash",
+        ws_array_decoding: bool = False,
+        ws_options: Optional[Dict[str, Any]] = None,
+    ) -> "AsyncInfo":
+        info = cls(
+            base_url,
+            skip_ws,
+            None,
+            None,
+            on_message_function,
+            pool,
+            ws_connections,
+            ws_shard_policy,
+            ws_array_decoding,
+            ws_options,
+        )
+        await info.load_universe(meta, spot_meta)
+        return info
+
+    async def load_universe(self, meta: Optional[Meta] = None, spot_meta: Optional[SpotMeta] = None) -> None:
+        """Fetch whichever of meta and spot_meta is missing, concurrently, and build the name tables."""
+        if meta is None and spot_meta is None:
+            meta, spot_meta = await asyncio.gather(self.meta(), self.spot_meta())
+        elif meta is None:
+            meta = await self.meta()
+        elif spot_meta is None:
+            spot_meta = await self.spot_meta()
+        self._set_universe(meta, spot_meta)
+
+    async def refresh_universe(self) -> int:
+        meta, spot_meta = await asyncio.gather(self.meta(), self.spot_meta())
+        self._universe_refreshed_at = time.monotonic()
+        return merge_universe(self.coin_to_asset, self.name_to_coin, meta, spot_meta)
+
+    def _refresh_universe_on_miss(self) -> None:
+        # Lookups stay synchronous, so a miss only schedules a refresh and the current lookup raises KeyError.
+        # At most one refresh is in flight and they are spaced by universe_refresh_interval.
+        if self._universe_refresh_task is not None and not self._universe_refresh_task.done():
+            return
+        if time.monotonic() - self._universe_refreshed_at < self.universe_refresh_interval:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Nothing to run the refresh on outside a loop, the lookup raises KeyError like the sync one
+            return
+        self._universe_refreshed_at = time.monotonic()
+        self._universe_refresh_task = loop.create_task(self.refresh_universe())
+        self._universe_refresh_task.add_done_callback(self._log_universe_refresh_error)
+
+    def _log_universe_refresh_error(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self._logger.warning(f"Universe refresh failed: {task.exception()}")
+
+    def start_universe_refresh(self, interval: float = 60) -> None:
+        """Refresh the universe every interval seconds from a task on the running loop."""
+
+        async def refresh_loop():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.refresh_universe()
+                except Exception as e:
+                    self._logger.warning(f"Universe refresh failed: {e}")
+
+        self.stop_universe_refresh()
+        self._universe_timer_task = asyncio.get_running_loop().create_task(refresh_loop())
+
+    def stop_universe_refresh(self) -> None:
+        if self._universe_timer_task is not None:
+            self._universe_timer_task.cancel()
+            self._universe_timer_task = None
+
+    async def _post_transform(self, url_path: str, payload: Any, transform: Callable[[Any], Any]) -> Any:
+        return transform(await self.post(url_path, payload))
+
+    async def _rest(self, method: Callable[..., Any], *args: Any) -> Any:
+        return await method(*args)
+
+    async def _fan_out(
+        self, request_type: str, addresses: List[str], max_concurrency: int, timeout: Optional[float]
+    ) -> BatchResult:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def query(address: str) -> Any:
+            async with semaphore:
+                return await self.post("/info", {"type": request_type, "user": address}, timeout)
+
+        responses = await asyncio.gather(*[query(address) for address in addresses], return_exceptions=True)
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+        for address, response in zip(addresses, responses):
+            if isinstance(response, Exception):
+                errors[address] = response
+            else:
+                results[address] = response
+        return BatchResult(results, errors)
@@ -6,7 +6,7 @@ import eth_account
 from eth_account.signers.local import LocalAccount
 
 from hyperliquid.api import API
-from hyperliquid.info import Info
+from hyperliquid.info import HyperliquidInfo
 from hyperliquid.utils.constants import MAINNET_API_URL
 from hyperliquid.utils.signing import (
     CancelByCloidRequest,
@@ -18,20 +18,24 @@ from hyperliquid.utils.signing import (
     OrderWire,
     ScheduleCancelAction,
     float_to_usd_int,
-    get_timestamp_ms,
     order_request_to_order_wire,
     order_wires_to_order_action,
     sign_agent,
     sign_approve_builder_fee,
     sign_convert_to_multi_sig_user_action,
-    sign_l1_action,
+    sign_l1_action_fast,
     sign_multi_sig_action,
     sign_spot_transfer_action,
     sign_usd_class_transfer_action,
     sign_usd_transfer_action,
     sign_withdraw_from_bridge_action,
 )
-from hyperliquid.utils.types import Any, BuilderInfo, Cloid, List, Meta, Optional, SpotMeta, Tuple
+from hyperliquid.utils.types import Any, BuilderInfo, Callable, Cloid, List, Meta, Optional, SpotMeta, Tuple
+from utils.market_context import MarketContext
+from utils.meta_cache import MetaCache
+from utils.nonce_manager import NonceManager, get_nonce_manager
+from utils.order_owners import OrderOwnerRegistry, get_default_registry
+from utils.order_store import OrderStore
 
 
 class Exchange(API):
@@ -46,14 +50,28 @@ class Exchange(API):
         vault_address: Optional[str] = None,
         account_address: Optional[str] = None,
         spot_meta: Optional[SpotMeta] = None,
+        meta_cache: Optional[MetaCache] = None,
+        order_owners: Optional[OrderOwnerRegistry] = None,
+        order_store: Optional[OrderStore] = None,
+        market_context: Optional[MarketContext] = None,
+        nonce_manager: Optional[NonceManager] = None,
     ):
         super().__init__(base_url)
         self.wallet = wallet
         self.vault_address = vault_address
         self.account_address = account_address
-        self.info = Info(base_url, True, meta, spot_meta)
-
-    def _post_action(self, action, signature, nonce):
+        self.info = HyperliquidInfo(base_url, True, meta, spot_meta, meta_cache=meta_cache)
+        # Records which user placed each order so websocket managers can route multiplexed order updates
+        self.order_owners = order_owners or get_default_registry()
+        # Local view of the resting orders, kept current by responses here and by orderUpdates when shared with a
+        # HyperliquidUserData
+        self.order_store = order_store
+        # Streamed mids and positions read by market orders, REST is used when they are stale
+        self.market_context = market_context
+        # Nonces are per signer, sharing the manager lets concurrent Exchanges of one wallet sign in parallel
+        self.nonce_manager = nonce_manager or get_nonce_manager(wallet.address)
+
+    def _post_action(self, action, signature, nonce, on_response: Optional[Callable[[Any], None]] = None):
         payload = {
             "action": action,
             "nonce": nonce,
@@ -61,7 +79,46 @@ class Exchange(API):
             "vaultAddress": self.vault_address if action["type"] != "usdClassTransfer" else None,
         }
         logging.debug(payload)
-        return self.post("/exchange", payload)
+        response = self.post("/exchange", payload)
+        if on_response is not None:
+            on_response(response)
+        return response
+
+    def _register_orders(
+        self, order_requests: List[OrderRequest], replaced: Optional[List[OidOrCloid]] = None
+    ) -> Callable[[Any], None]:
+        """Register the cloids now, so updates racing the response can be routed, and the oids once it arrives.
+
+        The resting orders of the response are added to order_store, replacing the orders in replaced for modifies.
+        """
+        user = self._user_address()
+        cloids = [order.get("cloid") for order in order_requests]
+        for cloid in cloids:
+            if cloid is not None:
+                self.order_owners.register(user, cloid=cloid)
+        if self.order_store is None:
+            return lambda response: self.order_owners.register_order_response(user, cloids, response)
+
+        orders = [{**order, "coin": self.info.coin_for_name(order["coin"])} for order in order_requests]
+
+        def on_response(response: Any) -> None:
+            self.order_owners.register_order_response(user, cloids, response)
+            self.order_store.apply_order_response(orders, response, replaced)
+
+        return on_response
+
+    def _register_cancels(self, targets: List[OidOrCloid]) -> Optional[Callable[[Any], None]]:
+        if self.order_store is None:
+            return None
+        return lambda response: self.order_store.apply_cancel_response(targets, response)
+
+    def _user_address(self) -> str:
+        address: str = self.wallet.address
+        if self.account_address:
+            address = self.account_address
+        if self.vault_address:
+            address = self.vault_address
+        return address
 
     def _slippage_price(
         self,
@@ -70,11 +127,31 @@ class Exchange(API):
         slippage: float,
         px: Optional[float] = None,
     ) -> float:
-        coin = self.info.name_to_coin[name]
+        coin = self.info.coin_for_name(name)
+        if not px:
+            px = self._local_mid(coin)
         if not px:
             # Get midprice
             px = float(self.info.all_mids()[coin])
+        return self._apply_slippage(coin, is_buy, slippage, px)
+
+    def _local_mid(self, coin: str) -> Optional[float]:
+        return self.market_context.mid(coin) if self.market_context is not None else None
+
+    def _local_position(self, coin: str) -> Optional[float]:
+        if self.market_context is None:
+            return None
+        return self.market_context.position(coin, self._user_address())
+
+    @staticmethod
+    def _position_from_state(user_state: Any, coin: str) -> Optional[float]:
+        for position in user_state["assetPositions"]:
+            item = position["position"]
+            if coin == item["coin"]:
+                return float(item["szi"])
+        return None
 
+    def _apply_slippage(self, coin: str, is_buy: bool, slippage: float, px: float) -> float:
         # spot assets start at 10000
         is_spot = self.info.coin_to_asset[coin] >= 10_000
 
@@ -110,13 +187,13 @@ class Exchange(API):
         order_wires: List[OrderWire] = [
             order_request_to_order_wire(order, self.info.name_to_asset(order["coin"])) for order in order_requests
         ]
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
 
         if builder:
             builder["b"] = builder["b"].lower()
         order_action = order_wires_to_order_action(order_wires, builder)
 
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             order_action,
             self.vault_address,
@@ -128,6 +205,7 @@ class Exchange(API):
             order_action,
             signature,
             timestamp,
+            self._register_orders(order_requests),
         )
 
     def modify_order(
@@ -156,7 +234,7 @@ class Exchange(API):
         return self.bulk_modify_orders_new([modify])
 
     def bulk_modify_orders_new(self, modify_requests: List[ModifyRequest]) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         modify_wires = [
             {
                 "oid": modify["oid"].to_raw() if isinstance(modify["oid"], Cloid) else modify["oid"],
@@ -170,7 +248,7 @@ class Exchange(API):
             "modifies": modify_wires,
         }
 
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             modify_action,
             self.vault_address,
@@ -182,6 +260,9 @@ class Exchange(API):
             modify_action,
             signature,
             timestamp,
+            self._register_orders(
+                [modify["order"] for modify in modify_requests], [modify["oid"] for modify in modify_requests]
+            ),
         )
 
     def market_open(
@@ -210,33 +291,27 @@ class Exchange(API):
         cloid: Optional[Cloid] = None,
         builder: Optional[BuilderInfo] = None,
     ) -> Any:
-        address: str = self.wallet.address
-        if self.account_address:
-            address = self.account_address
-        if self.vault_address:
-            address = self.vault_address
-        positions = self.info.user_state(address)["assetPositions"]
-        for position in positions:
-            item = position["position"]
-            if coin != item["coin"]:
-                continue
-            szi = float(item["szi"])
-            if not sz:
-                sz = abs(szi)
-            is_buy = True if szi < 0 else False
-            # Get aggressive Market Price
-            px = self._slippage_price(coin, is_buy, slippage, px)
-            # Market Order is an aggressive Limit Order IoC
-            return self.order(
-                coin,
-                is_buy,
-                sz,
-                px,
-                order_type={"limit": {"tif": "Ioc"}},
-                reduce_only=True,
-                cloid=cloid,
-                builder=builder,
-            )
+        szi = self._local_position(coin)
+        if szi is None:
+            szi = self._position_from_state(self.info.user_state(self._user_address()), coin)
+        if not szi:
+            return None
+        if not sz:
+            sz = abs(szi)
+        is_buy = True if szi < 0 else False
+        # Get aggressive Market Price
+        px = self._slippage_price(coin, is_buy, slippage, px)
+        # Market Order is an aggressive Limit Order IoC
+        return self.order(
+            coin,
+            is_buy,
+            sz,
+            px,
+            order_type={"limit": {"tif": "Ioc"}},
+            reduce_only=True,
+            cloid=cloid,
+            builder=builder,
+        )
 
     def cancel(self, name: str, oid: int) -> Any:
         return self.bulk_cancel([{"coin": name, "oid": oid}])
@@ -245,7 +320,7 @@ class Exchange(API):
         return self.bulk_cancel_by_cloid([{"coin": name, "cloid": cloid}])
 
     def bulk_cancel(self, cancel_requests: List[CancelRequest]) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         cancel_action = {
             "type": "cancel",
             "cancels": [
@@ -256,7 +331,7 @@ class Exchange(API):
                 for cancel in cancel_requests
             ],
         }
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             cancel_action,
             self.vault_address,
@@ -268,10 +343,11 @@ class Exchange(API):
             cancel_action,
             signature,
             timestamp,
+            self._register_cancels([cancel["oid"] for cancel in cancel_requests]),
         )
 
     def bulk_cancel_by_cloid(self, cancel_requests: List[CancelByCloidRequest]) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
 
         cancel_action = {
             "type": "cancelByCloid",
@@ -283,7 +359,7 @@ class Exchange(API):
                 for cancel in cancel_requests
             ],
         }
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             cancel_action,
             self.vault_address,
@@ -295,8 +371,35 @@ class Exchange(API):
             cancel_action,
             signature,
             timestamp,
+            self._register_cancels([cancel["cloid"] for cancel in cancel_requests]),
         )
 
+    def cancel_open_orders(
+        self,
+        name: str,
+        is_buy: Optional[bool] = None,
+        min_px: Optional[float] = None,
+        max_px: Optional[float] = None,
+    ) -> Any:
+        """Cancel the resting orders of order_store matching the filters, without querying open orders.
+
+        Args:
+            name (str): Coin or spot pair name.
+            is_buy (bool): Only bids (True) or only asks (False).
+            min_px (float): Lowest limit price, inclusive.
+            max_px (float): Highest limit price, inclusive.
+
+        Returns:
+            The cancel response, or None if no order matched
+        """
+        if self.order_store is None:
+            raise RuntimeError("Cannot call cancel_open_orders without an order_store")
+        side = None if is_buy is None else ("B" if is_buy else "A")
+        orders = self.order_store.orders(self.info.coin_for_name(name), side, min_px, max_px)
+        if not orders:
+            return None
+        return self.bulk_cancel([{"coin": name, "oid": order["oid"]} for order in orders])
+
     def schedule_cancel(self, time: Optional[int]) -> Any:
         """Schedules a time (in UTC millis) to cancel all open orders. The time must be at least 5 seconds after the current time.
         Once the time comes, all open orders will be canceled and a trigger count will be incremented. The max number of triggers
@@ -305,13 +408,13 @@ class Exchange(API):
         Args:
             time (int): if time is not None, then set the cancel time in the future. If None, then unsets any cancel time in the future.
         """
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         schedule_cancel_action: ScheduleCancelAction = {
             "type": "scheduleCancel",
         }
         if time is not None:
             schedule_cancel_action["time"] = time
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             schedule_cancel_action,
             self.vault_address,
@@ -325,14 +428,14 @@ class Exchange(API):
         )
 
     def update_leverage(self, leverage: int, name: str, is_cross: bool = True) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         update_leverage_action = {
             "type": "updateLeverage",
             "asset": self.info.name_to_asset(name),
             "isCross": is_cross,
             "leverage": leverage,
         }
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             update_leverage_action,
             self.vault_address,
@@ -346,7 +449,7 @@ class Exchange(API):
         )
 
     def update_isolated_margin(self, amount: float, name: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         amount = float_to_usd_int(amount)
         update_isolated_margin_action = {
             "type": "updateIsolatedMargin",
@@ -354,7 +457,7 @@ class Exchange(API):
             "isBuy": True,
             "ntli": amount,
         }
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             update_isolated_margin_action,
             self.vault_address,
@@ -368,12 +471,12 @@ class Exchange(API):
         )
 
     def set_referrer(self, code: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         set_referrer_action = {
             "type": "setReferrer",
             "code": code,
         }
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             set_referrer_action,
             None,
@@ -387,12 +490,12 @@ class Exchange(API):
         )
 
     def create_sub_account(self, name: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         create_sub_account_action = {
             "type": "createSubAccount",
             "name": name,
         }
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             create_sub_account_action,
             None,
@@ -406,7 +509,7 @@ class Exchange(API):
         )
 
     def usd_class_transfer(self, amount: float, to_perp: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         str_amount = str(amount)
         if self.vault_address:
             str_amount += f" subaccount:{self.vault_address}"
@@ -425,14 +528,14 @@ class Exchange(API):
         )
 
     def sub_account_transfer(self, sub_account_user: str, is_deposit: bool, usd: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         sub_account_transfer_action = {
             "type": "subAccountTransfer",
             "subAccountUser": sub_account_user,
             "isDeposit": is_deposit,
             "usd": usd,
         }
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             sub_account_transfer_action,
             None,
@@ -446,7 +549,7 @@ class Exchange(API):
         )
 
     def sub_account_spot_transfer(self, sub_account_user: str, is_deposit: bool, token: str, amount: float) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         sub_account_transfer_action = {
             "type": "subAccountSpotTransfer",
             "subAccountUser": sub_account_user,
@@ -454,7 +557,7 @@ class Exchange(API):
             "token": token,
             "amount": str(amount),
         }
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             sub_account_transfer_action,
             None,
@@ -468,7 +571,7 @@ class Exchange(API):
         )
 
     def vault_usd_transfer(self, vault_address: str, is_deposit: bool, usd: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         vault_transfer_action = {
             "type": "vaultTransfer",
             "vaultAddress": vault_address,
@@ -476,7 +579,7 @@ class Exchange(API):
             "usd": usd,
         }
         is_mainnet = self.base_url == MAINNET_API_URL
-        signature = sign_l1_action(self.wallet, vault_transfer_action, None, timestamp, is_mainnet)
+        signature = sign_l1_action_fast(self.wallet, vault_transfer_action, None, timestamp, is_mainnet)
         return self._post_action(
             vault_transfer_action,
             signature,
@@ -484,7 +587,7 @@ class Exchange(API):
         )
 
     def usd_transfer(self, amount: float, destination: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         action = {"destination": destination, "amount": str(amount), "time": timestamp, "type": "usdSend"}
         is_mainnet = self.base_url == MAINNET_API_URL
         signature = sign_usd_transfer_action(self.wallet, action, is_mainnet)
@@ -495,7 +598,7 @@ class Exchange(API):
         )
 
     def spot_transfer(self, amount: float, destination: str, token: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         action = {
             "destination": destination,
             "amount": str(amount),
@@ -512,7 +615,7 @@ class Exchange(API):
         )
 
     def withdraw_from_bridge(self, amount: float, destination: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         action = {"destination": destination, "amount": str(amount), "time": timestamp, "type": "withdraw3"}
         is_mainnet = self.base_url == MAINNET_API_URL
         signature = sign_withdraw_from_bridge_action(self.wallet, action, is_mainnet)
@@ -525,7 +628,7 @@ class Exchange(API):
     def approve_agent(self, name: Optional[str] = None) -> Tuple[Any, str]:
         agent_key = "0x" + secrets.token_hex(32)
         account = eth_account.Account.from_key(agent_key)
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         is_mainnet = self.base_url == MAINNET_API_URL
         action = {
             "type": "approveAgent",
@@ -547,14 +650,14 @@ class Exchange(API):
         )
 
     def approve_builder_fee(self, builder: str, max_fee_rate: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
 
         action = {"maxFeeRate": max_fee_rate, "builder": builder, "nonce": timestamp, "type": "approveBuilderFee"}
         signature = sign_approve_builder_fee(self.wallet, action, self.base_url == MAINNET_API_URL)
         return self._post_action(action, signature, timestamp)
 
     def convert_to_multi_sig_user(self, authorized_users: List[str], threshold: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         authorized_users = sorted(authorized_users)
         signers = {
             "authorizedUsers": authorized_users,
@@ -599,12 +702,12 @@ class Exchange(API):
         )
 
     def use_big_blocks(self, enable: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next()
         action = {
             "type": "evmUserModify",
             "usingBigBlocks": enable,
         }
-        signature = sign_l1_action(
+        signature = sign_l1_action_fast(
             self.wallet,
             action,
             None,
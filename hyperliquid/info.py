@@ -1,21 +1,36 @@
 import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
 
 from hyperliquid.api import API
 from hyperliquid.utils.types import (
     Any,
+    BatchResult,
     Callable,
     Cloid,
+    Dict,
+    List,
     Meta,
     Optional,
     SpotMeta,
     SpotMetaAndAssetCtxs,
     Subscription,
+    Union,
     cast,
 )
+from hyperliquid.utils.universe import merge_universe
+from utils.array_codec import candles_to_array, l2_book_to_arrays
+from utils.meta_cache import MetaCache
 from utils.websocket_manager import WebsocketManager
+from utils.websocket_pool import ShardPolicy, WebsocketPoolManager
 
 
 class HyperliquidInfo(API):
+    # Minimum seconds between two universe refreshes triggered by lookups of unknown names
+    universe_refresh_interval = 5.0
+
     def __init__(
         self,
         base_url: Optional[str] = None,
@@ -23,34 +38,168 @@ class HyperliquidInfo(API):
         meta: Optional[Meta] = None,
         spot_meta: Optional[SpotMeta] = None,
         on_message_function = None,
+        meta_cache: Optional[MetaCache] = None,
+        ws_connections: int = 1,
+        ws_shard_policy: ShardPolicy = "coin_hash",
+        ws_array_decoding: bool = False,
+        ws_options: Optional[Dict[str, Any]] = None,
     ):
         super().__init__(base_url)
 
-        if not skip_ws:
-            self.ws_manager = WebsocketManager(
-                base_url=self.base_url,
-                process_message_function=on_message_function)
+        self._init_ws(skip_ws, on_message_function, ws_connections, ws_shard_policy, ws_array_decoding, ws_options)
+        self._init_universe_refresh(meta_cache)
+        if meta_cache is not None and meta is None and spot_meta is None:
+            # Share the cache's tables so every instance sees the same universe
+            meta_cache.load()
+            self.coin_to_asset = meta_cache.coin_to_asset
+            self.name_to_coin = meta_cache.name_to_coin
+            return
+
         if meta is None:
             meta = self.meta()
 
         if spot_meta is None:
             spot_meta = self.spot_meta()
 
-        self.coin_to_asset = {asset_info["name"]: asset for (asset, asset_info) in enumerate(meta["universe"])}
-        self.name_to_coin = {asset_info["name"]: asset_info["name"] for asset_info in meta["universe"]}
-
-        # spot assets start at 10000
-        for spot_info in spot_meta["universe"]:
-            self.coin_to_asset[spot_info["name"]] = spot_info["index"] + 10000
-            self.name_to_coin[spot_info["name"]] = spot_info["name"]
-            base, quote = spot_info["tokens"]
-            name = f'{spot_meta["tokens"][base]["name"]}/{spot_meta["tokens"][quote]["name"]}'
-            if name not in self.name_to_coin:
-                self.name_to_coin[name] = spot_info["name"]
-
-    async def connect_websocket(self):
-        await self.ws_manager.run()
-    
+        self._set_universe(meta, spot_meta)
+
+    def _init_ws(
+        self,
+        skip_ws: Optional[bool],
+        on_message_function,
+        ws_connections: int = 1,
+        ws_shard_policy: ShardPolicy = "coin_hash",
+        ws_array_decoding: bool = False,
+        ws_options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        # ws_options are passed through to every WebsocketManager, e.g. queue_maxsize and queue_policies.
+        # Reconnects re-snapshot state over REST unless resync_function is overridden (None disables it).
+        ws_options = {"resync_function": self._resync_websocket, **(ws_options or {})}
+        self.ws_manager: Optional[Union[WebsocketManager, WebsocketPoolManager]] = None
+        if skip_ws:
+            return
+        if ws_connections > 1:
+            self.ws_manager = WebsocketPoolManager(
+                base_url=self.base_url,
+                connections=ws_connections,
+                policy=ws_shard_policy,
+                process_message_function=on_message_function,
+                array_decoding=ws_array_decoding,
+                **ws_options)
+        else:
+            self.ws_manager = WebsocketManager(
+                base_url=self.base_url,
+                process_message_function=on_message_function,
+                array_decoding=ws_array_decoding,
+                **ws_options)
+
+    async def _rest(self, method: Callable[..., Any], *args: Any) -> Any:
+        # Keep blocking requests off the websocket's event loop
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(method, *args))
+
+    async def _resync_websocket(self, subscriptions: List[Subscription], since_ms: int) -> List[Any]:
+        """
+        REST snapshots of the state websocket consumers may have missed during an outage, as websocket messages.
+
+        l2Book subscriptions get a fresh l2_snapshot, userFills and userEvents the fills since since_ms, and
+        orderUpdates the full list of open orders as an orderUpdates message flagged isSnapshot (orders missing from
+        it are no longer open). Every message carries "resync": True. Requests run concurrently.
+
+        Args:
+            subscriptions (list): Subscriptions of the reconnected websocket.
+            since_ms (int): Time of the last message received before the outage.
+
+        Returns:
+            list: Messages to dispatch before the live stream resumes
+        """
+
+        async def l2_book(coin: str) -> Any:
+            return {"channel": "l2Book", "data": await self._rest(self.l2_snapshot, coin), "resync": True}
+
+        async def fills(channel: str, user: str) -> Any:
+            user_fills = await self._rest(self.user_fills_by_time, user, since_ms)
+            if channel == "user":
+                return {"channel": "user", "data": {"fills": user_fills}, "user": user, "resync": True}
+            return {
+                "channel": "userFills",
+                "data": {"user": user, "isSnapshot": True, "fills": user_fills},
+                "resync": True,
+            }
+
+        async def open_orders(user: str) -> Any:
+            orders = await self._rest(self.frontend_open_orders, user)
+            updates = [{"order": order, "status": "open", "statusTimestamp": order["timestamp"]} for order in orders]
+            return {"channel": "orderUpdates", "data": updates, "user": user, "isSnapshot": True, "resync": True}
+
+        requests = []
+        for subscription in subscriptions:
+            if subscription["type"] == "l2Book":
+                requests.append(l2_book(subscription["coin"]))
+            elif subscription["type"] == "userFills":
+                requests.append(fills("userFills", subscription["user"]))
+            elif subscription["type"] == "userEvents":
+                requests.append(fills("user", subscription["user"]))
+            elif subscription["type"] == "orderUpdates":
+                requests.append(open_orders(subscription["user"]))
+        messages = []
+        for subscription_result in await asyncio.gather(*requests, return_exceptions=True):
+            if isinstance(subscription_result, Exception):
+                self._logger.warning(f"Websocket resync request failed: {subscription_result!r}")
+            else:
+                messages.append(subscription_result)
+        return messages
+
+    def _init_universe_refresh(self, meta_cache: Optional[MetaCache] = None) -> None:
+        self._meta_cache = meta_cache
+        self._universe_lock = threading.Lock()
+        self._universe_generation = 0
+        self._universe_refreshed_at = 0.0
+        self._stop_universe_refresh = threading.Event()
+
+    def _set_universe(self, meta: Meta, spot_meta: SpotMeta) -> None:
+        self.coin_to_asset: Dict[str, int] = {}
+        self.name_to_coin: Dict[str, str] = {}
+        merge_universe(self.coin_to_asset, self.name_to_coin, meta, spot_meta)
+
+    async def connect_websocket(self, threaded: bool = False, executor: Optional[Executor] = None):
+        """
+        Run the websocket until disconnect_websocket is called.
+
+        Args:
+            threaded (bool): Read and decode frames on a dedicated thread. Callbacks still run on the calling
+                event loop, or on executor when given, so a slow callback can not delay reading the socket.
+            executor (Executor): Worker pool for the callbacks in threaded mode.
+        """
+        if self.ws_manager is None:
+            raise RuntimeError("Cannot call connect_websocket since skip_ws was used")
+        if not threaded:
+            await self.ws_manager.run()
+            return
+        dispatch_loop = asyncio.get_running_loop() if executor is None else None
+        try:
+            await asyncio.wrap_future(self.ws_manager.start(dispatch_loop, executor))
+        except asyncio.CancelledError:
+            self.ws_manager.stop()
+            raise
+
+    def start_websocket(
+        self, dispatch_loop: Optional[asyncio.AbstractEventLoop] = None, executor: Optional[Executor] = None
+    ) -> Future:
+        """
+        Run the websocket on a dedicated thread without an event loop of your own.
+
+        Args:
+            dispatch_loop (AbstractEventLoop): Loop the callbacks are scheduled on.
+            executor (Executor): Worker pool the callbacks run on. Without either, callbacks run in order on a
+                single worker thread.
+
+        Returns:
+            Future: Resolved when the websocket stops
+        """
+        if self.ws_manager is None:
+            raise RuntimeError("Cannot call start_websocket since skip_ws was used")
+        return self.ws_manager.start(dispatch_loop, executor)
+
     def disconnect_websocket(self):
         if self.ws_manager is None:
             raise RuntimeError("Cannot call disconnect_websocket since skip_ws was used")
@@ -381,7 +530,7 @@ class HyperliquidInfo(API):
                 ...
             ]
         """
-        coin = self.name_to_coin[name]
+        coin = self.coin_for_name(name)
         if endTime is not None:
             return self.post(
                 "/info", {"type": "fundingHistory", "coin": coin, "startTime": startTime, "endTime": endTime}
@@ -406,13 +555,15 @@ class HyperliquidInfo(API):
             return self.post("/info", {"type": "userFunding", "user": user, "startTime": startTime, "endTime": endTime})
         return self.post("/info", {"type": "userFunding", "user": user, "startTime": startTime})
 
-    def l2_snapshot(self, name: str) -> Any:
+    def l2_snapshot(self, name: str, as_array: bool = False) -> Any:
         """Retrieve L2 snapshot for a given coin
 
         POST /info
 
         Args:
             name (str): Coin to retrieve L2 snapshot for.
+            as_array (bool): Return levels as a (bids, asks) pair of NumPy structured arrays with px, sz and n
+                fields instead of lists of dicts, see utils.array_codec. Requires numpy.
 
         Returns:
             {
@@ -431,9 +582,14 @@ class HyperliquidInfo(API):
                 time: int
             }
         """
-        return self.post("/info", {"type": "l2Book", "coin": self.name_to_coin[name]})
-
-    def candles_snapshot(self, name: str, interval: str, startTime: int, endTime: int) -> Any:
+        payload = {"type": "l2Book", "coin": self.coin_for_name(name)}
+        if as_array:
+            return self._post_transform("/info", payload, l2_book_to_arrays)
+        return self.post("/info", payload)
+
+    def candles_snapshot(
+        self, name: str, interval: str, startTime: int, endTime: int, as_array: bool = False
+    ) -> Any:
         """Retrieve candles snapshot for a given coin
 
         POST /info
@@ -443,6 +599,8 @@ class HyperliquidInfo(API):
             interval (str): Candlestick interval.
             startTime (int): Unix timestamp in milliseconds.
             endTime (int): Unix timestamp in milliseconds.
+            as_array (bool): Return a NumPy structured array with t, T, o, h, l, c, v and n fields instead of a
+                list of dicts, see utils.array_codec. Requires numpy.
 
         Returns:
             [
@@ -461,7 +619,9 @@ class HyperliquidInfo(API):
                 ...
             ]
         """
-        req = {"coin": self.name_to_coin[name], "interval": interval, "startTime": startTime, "endTime": endTime}
+        req = {"coin": self.coin_for_name(name), "interval": interval, "startTime": startTime, "endTime": endTime}
+        if as_array:
+            return self._post_transform("/info", {"type": "candleSnapshot", "req": req}, candles_to_array)
         return self.post("/info", {"type": "candleSnapshot", "req": req})
 
     def user_fees(self, address: str) -> Any:
@@ -572,9 +732,67 @@ class HyperliquidInfo(API):
     def query_user_to_multi_sig_signers(self, multi_sig_user: str) -> Any:
         return self.post("/info", {"type": "userToMultiSigSigners", "user": multi_sig_user})
 
+    def _post_transform(self, url_path: str, payload: Any, transform: Callable[[Any], Any]) -> Any:
+        return transform(self.post(url_path, payload))
+
+    def _fan_out(
+        self, request_type: str, addresses: List[str], max_concurrency: int, timeout: Optional[float]
+    ) -> BatchResult:
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+        if not addresses:
+            return BatchResult(results, errors)
+        workers = min(max_concurrency, len(addresses))
+        # Every worker keeps its connection, the default adapter would discard those above 10 after each request
+        self._ensure_pool_size(workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.post, "/info", {"type": request_type, "user": address}, timeout): address
+                for address in addresses
+            }
+            for future in as_completed(futures):
+                address = futures[future]
+                try:
+                    results[address] = future.result()
+                except Exception as e:
+                    errors[address] = e
+        return BatchResult(results, errors)
+
+    def user_states(self, addresses: List[str], max_concurrency: int = 10, timeout: Optional[float] = 10) -> BatchResult:
+        """Retrieve user_state for many users concurrently.
+
+        POST /info
+
+        Args:
+            addresses (List[str]): Onchain addresses in 42-character hexadecimal format.
+            max_concurrency (int): Maximum number of requests in flight.
+            timeout (Optional[float]): Per-request timeout in seconds.
+
+        Returns:
+            BatchResult(results, errors) where results maps each address to its user_state response and errors
+            maps each failed address to the raised exception.
+        """
+        return self._fan_out("clearinghouseState", addresses, max_concurrency, timeout)
+
+    def spot_user_states(
+        self, addresses: List[str], max_concurrency: int = 10, timeout: Optional[float] = 10
+    ) -> BatchResult:
+        """Retrieve spot_user_state for many users concurrently, see user_states."""
+        return self._fan_out("spotClearinghouseState", addresses, max_concurrency, timeout)
+
+    def users_open_orders(
+        self, addresses: List[str], max_concurrency: int = 10, timeout: Optional[float] = 10
+    ) -> BatchResult:
+        """Retrieve open_orders for many users concurrently, see user_states."""
+        return self._fan_out("openOrders", addresses, max_concurrency, timeout)
+
+    def users_fills(self, addresses: List[str], max_concurrency: int = 10, timeout: Optional[float] = 10) -> BatchResult:
+        """Retrieve user_fills for many users concurrently, see user_states."""
+        return self._fan_out("userFills", addresses, max_concurrency, timeout)
+
     def subscribe(self, subscription: Subscription, callback: Callable[[Any], None]) -> int:
         if subscription["type"] == "l2Book" or subscription["type"] == "trades" or subscription["type"] == "candle":
-            subscription["coin"] = self.name_to_coin[subscription["coin"]]
+            subscription["coin"] = self.coin_for_name(subscription["coin"])
         if self.ws_manager is None:
             raise RuntimeError("Cannot call subscribe since skip_ws was used")
         else:
@@ -582,11 +800,70 @@ class HyperliquidInfo(API):
 
     def unsubscribe(self, subscription: Subscription, subscription_id: int) -> bool:
         if subscription["type"] == "l2Book" or subscription["type"] == "trades" or subscription["type"] == "candle":
-            subscription["coin"] = self.name_to_coin[subscription["coin"]]
+            subscription["coin"] = self.coin_for_name(subscription["coin"])
         if self.ws_manager is None:
             raise RuntimeError("Cannot call unsubscribe since skip_ws was used")
         else:
             return self.ws_manager.unsubscribe(subscription, subscription_id)
 
+    def coin_for_name(self, name: str) -> str:
+        try:
+            return self.name_to_coin[name]
+        except KeyError:
+            self._refresh_universe_on_miss()
+            return self.name_to_coin[name]
+
     def name_to_asset(self, name: str) -> int:
-        return self.coin_to_asset[self.name_to_coin[name]]
+        try:
+            return self.coin_to_asset[self.name_to_coin[name]]
+        except KeyError:
+            self._refresh_universe_on_miss()
+            return self.coin_to_asset[self.name_to_coin[name]]
+
+    def refresh_universe(self) -> int:
+        """Fetch meta and spot_meta and merge newly listed assets into the lookup tables.
+
+        Known entries are left untouched, so lookups of existing assets never wait on a refresh.
+
+        Returns:
+            Number of assets added.
+        """
+        if self._meta_cache is not None:
+            return self._meta_cache.refresh()
+        return merge_universe(self.coin_to_asset, self.name_to_coin, self.meta(), self.spot_meta())
+
+    def _refresh_universe_on_miss(self) -> None:
+        # Concurrent misses coalesce into a single refresh: whoever waited on the lock while another caller
+        # refreshed sees the generation change and retries its lookup right away.
+        generation = self._universe_generation
+        with self._universe_lock:
+            if self._universe_generation != generation:
+                return
+            if time.monotonic() - self._universe_refreshed_at < self.universe_refresh_interval:
+                return
+            try:
+                self.refresh_universe()
+            except Exception as e:
+                self._logger.warning(f"Universe refresh failed: {e}")
+            finally:
+                self._universe_refreshed_at = time.monotonic()
+                self._universe_generation += 1
+
+    def start_universe_refresh(self, interval: float = 60) -> None:
+        """Refresh the universe every interval seconds from a daemon thread."""
+
+        def refresh_loop():
+            while not self._stop_universe_refresh.wait(interval):
+                try:
+                    with self._universe_lock:
+                        self.refresh_universe()
+                        self._universe_refreshed_at = time.monotonic()
+                        self._universe_generation += 1
+                except Exception as e:
+                    self._logger.warning(f"Universe refresh failed: {e}")
+
+        self._stop_universe_refresh.clear()
+        threading.Thread(target=refresh_loop, daemon=True).start()
+
+    def stop_universe_refresh(self) -> None:
+        self._stop_universe_refresh.set()
@@ -0,0 +1,60 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib codec is used without it
+    orjson = None
+
+from hyperliquid.utils.types import Any, Callable, Dict, NamedTuple, Optional, Union
+
+# loads accepts str or bytes, dumps always returns str so the result can go in a websocket text frame
+JsonCodec = NamedTuple(
+    "JsonCodec",
+    [
+        ("name", str),
+        ("loads", Callable[[Union[str, bytes]], Any]),
+        ("dumps", Callable[[Any], str]),
+    ],
+)
+
+STDLIB_CODEC = JsonCodec("json", json.loads, json.dumps)
+
+CODECS: Dict[str, JsonCodec] = {"json": STDLIB_CODEC}
+
+if orjson is not None:
+
+    def _orjson_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    CODECS["orjson"] = JsonCodec("orjson", orjson.loads, _orjson_dumps)
+
+_default_codec = CODECS.get("orjson", STDLIB_CODEC)
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Look up a codec by name, or the default codec when name is None.
+
+    Args:
+        name (str): "json" or "orjson".
+
+    Returns:
+        JsonCodec: The codec
+    """
+    if name is None:
+        return _default_codec
+    if name not in CODECS:
+        raise ValueError(f"JSON codec {name} is not available, choose from {sorted(CODECS)}")
+    return CODECS[name]
+
+
+def set_default_codec(codec: Union[str, JsonCodec]) -> None:
+    """Codec used by API, AsyncAPI and WebsocketManager instances created afterwards without an explicit codec."""
+    global _default_codec
+    _default_codec = get_codec(codec) if isinstance(codec, str) else codec
+
+
+def resolve_codec(codec: Union[None, str, JsonCodec]) -> JsonCodec:
+    if codec is None or isinstance(codec, str):
+        return get_codec(codec)
+    return codec
@@ -5,7 +5,7 @@ import msgpack
 from eth_account.messages import encode_typed_data
 from eth_utils import keccak, to_hex
 
-from hyperliquid.utils.types import Cloid, Literal, NotRequired, Optional, TypedDict, Union
+from hyperliquid.utils.types import Cloid, Dict, Literal, NotRequired, Optional, TypedDict, Union
 
 Tif = Union[Literal["Alo"], Literal["Ioc"], Literal["Gtc"]]
 Tpsl = Union[Literal["tp"], Literal["sl"]]
@@ -149,6 +149,38 @@ def construct_phantom_agent(hash, is_mainnet):
     return {"source": "a" if is_mainnet else "b", "connectionId": hash}
 
 
+# sign_l1_action always signs the same EIP-712 domain and Agent type, only the message changes. The hashes below
+# let sign_l1_action_fast build the final digest with three keccak calls instead of re-encoding the typed data.
+EIP712_DOMAIN_TYPE_HASH = keccak(
+    text="EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"
+)
+AGENT_TYPE_HASH = keccak(text="Agent(string source,bytes32 connectionId)")
+L1_DOMAIN_SEPARATOR = keccak(
+    EIP712_DOMAIN_TYPE_HASH
+    + keccak(text="Exchange")
+    + keccak(text="1")
+    + (1337).to_bytes(32, "big")
+    + (b"\x00" * 12 + address_to_bytes("0x0000000000000000000000000000000000000000"))
+)
+# Agent struct hash prefix (type hash + hashed source) per network, keyed by is_mainnet
+L1_AGENT_PREFIX = {
+    True: AGENT_TYPE_HASH + keccak(text="a"),
+    False: AGENT_TYPE_HASH + keccak(text="b"),
+}
+
+
+def l1_action_digest(action, active_pool, nonce, is_mainnet) -> bytes:
+    hash = action_hash(action, active_pool, nonce)
+    struct_hash = keccak(L1_AGENT_PREFIX[is_mainnet] + hash)
+    return keccak(b"\x19\x01" + L1_DOMAIN_SEPARATOR + struct_hash)
+
+
+def sign_l1_action_fast(wallet, action, active_pool, nonce, is_mainnet):
+    """Same signature as sign_l1_action, computed from the precomputed domain separator and Agent type hash."""
+    signed = wallet.unsafe_sign_hash(l1_action_digest(action, active_pool, nonce, is_mainnet))
+    return {"r": to_hex(signed["r"]), "s": to_hex(signed["s"]), "v": signed["v"]}
+
+
 def sign_l1_action(wallet, action, active_pool, nonce, is_mainnet):
     hash = action_hash(action, active_pool, nonce)
     phantom_agent = construct_phantom_agent(hash, is_mainnet)
@@ -363,12 +395,35 @@ def sign_inner(wallet, data):
     return {"r": to_hex(signed["r"]), "s": to_hex(signed["s"]), "v": signed["v"]}
 
 
+# Recently converted values, prices and sizes repeat a lot when requoting around the same levels
+FLOAT_TO_WIRE_CACHE_SIZE = 4096
+_float_to_wire_cache: Dict[float, str] = {}
+
+
 def float_to_wire(x: float) -> str:
+    wire = _float_to_wire_cache.get(x)
+    if wire is not None:
+        return wire
+    wire = _float_to_wire(x)
+    # 0.0 and -0.0 share a cache key but not a wire format, keep them out of the cache
+    if x != 0:
+        if len(_float_to_wire_cache) >= FLOAT_TO_WIRE_CACHE_SIZE:
+            _float_to_wire_cache.clear()
+        _float_to_wire_cache[x] = wire
+    return wire
+
+
+def _float_to_wire(x: float) -> str:
     rounded = f"{x:.8f}"
     if abs(float(rounded) - x) >= 1e-12:
         raise ValueError("float_to_wire causes rounding", x)
     if rounded == "-0":
         rounded = "0"
+    # Stripping trailing zeros gives the same string as Decimal.normalize for finite values, as long as the value
+    # fits in the 28 significant digits of the default Decimal context; anything longer or non-finite goes through
+    # Decimal so that its rounding is preserved.
+    if len(rounded) <= 28 and "." in rounded:
+        return rounded.rstrip("0").rstrip(".")
     normalized = Decimal(rounded).normalize()
     return f"{normalized:f}"
 
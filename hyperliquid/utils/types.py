@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional, Tuple, TypedDict, Union, cast
+from typing import Any, Callable, Dict, Iterable, List, Literal, NamedTuple, Optional, Set, Tuple, TypedDict, Union, cast
 from typing_extensions import NotRequired
 
 Any = Any
@@ -110,6 +110,9 @@ OtherWsMsg = TypedDict(
 )
 WsMsg = Union[AllMidsMsg, L2BookMsg, TradesMsg, UserEventsMsg, PongMsg, UserFillsMsg, OtherWsMsg]
 
+# results and errors are keyed by the queried address, an address appears in exactly one of them
+BatchResult = NamedTuple("BatchResult", [("results", Dict[str, Any]), ("errors", Dict[str, Exception])])
+
 # b is the public address of the builder, f is the amount of the fee in tenths of basis points. e.g. 10 means 1 basis point
 BuilderInfo = TypedDict("BuilderInfo", {"b": str, "f": int})
 
@@ -0,0 +1,28 @@
+from hyperliquid.utils.types import Dict, Meta, SpotMeta
+
+
+def merge_universe(
+    coin_to_asset: Dict[str, int], name_to_coin: Dict[str, str], meta: Meta, spot_meta: SpotMeta
+) -> int:
+    """Add the assets of meta and spot_meta that are missing from the lookup tables, in place.
+
+    Existing entries are never overwritten, so the tables can be shared with readers while they are merged into.
+    Returns the number of coins added to coin_to_asset.
+    """
+    added = 0
+    for asset, asset_info in enumerate(meta["universe"]):
+        if asset_info["name"] not in coin_to_asset:
+            coin_to_asset[asset_info["name"]] = asset
+            added += 1
+        name_to_coin.setdefault(asset_info["name"], asset_info["name"])
+
+    # spot assets start at 10000
+    for spot_info in spot_meta["universe"]:
+        if spot_info["name"] not in coin_to_asset:
+            coin_to_asset[spot_info["name"]] = spot_info["index"] + 10000
+            added += 1
+        name_to_coin.setdefault(spot_info["name"], spot_info["name"])
+        base, quote = spot_info["tokens"]
+        name = f'{spot_meta["tokens"][base]["name"]}/{spot_meta["tokens"][quote]["name"]}'
+        name_to_coin.setdefault(name, spot_info["name"])
+    return added
@@ -1,48 +1,78 @@
 import os
 import asyncio
 
+from hyperliquid.api import API
 from hyperliquid.info import HyperliquidInfo
-from utils.spot_info import HyperSpotInfo
 from hyperliquid.utils import constants
+from hyperliquid.utils.signing import get_timestamp_ms
+from utils.account_state import AccountState
 
 class HyperliquidUserData(HyperliquidInfo):
     def __init__(
         self,
         order_update_function=None,
-        fills_update_function=None
+        fills_update_function=None,
+        address=None,
+        base_url=constants.MAINNET_API_URL,
+        reconcile_interval=60,
+        spot_meta=None,
+        order_store=None,
+        **info_options
     ):
-        self.address = os.getenv('ACCOUNT_ADDRESS')
-        self.hyperliquid_spot_info = HyperSpotInfo()
-        self.balance = {}
-        self.orders = {}
+        """
+        Streaming account state of one user.
 
-        self.hyperliquid_stream = HyperliquidInfo(
-            base_url=constants.MAINNET_API_URL,
+        orderUpdates, userFills and userNonFundingLedgerUpdates are applied
+        in order to an AccountState as they arrive, so balances, positions
+        and open orders are read locally instead of polling user_state and
+        spot_user_state. Every reconcile_interval seconds the state is
+        replaced by REST snapshots and the drift is logged.
+
+        Args:
+            order_update_function (callable): Called with the data of every orderUpdates message, after it is applied.
+            fills_update_function (callable): Called with the data of every userFills message, after it is applied.
+            address (str): User address, defaults to the ACCOUNT_ADDRESS environment variable.
+            reconcile_interval (float): Seconds between REST reconciliations, None to only reconcile on start.
+            order_store (OrderStore): Store the open orders are kept in, pass the same store to Exchange to give it
+                a local view of what is resting.
+            info_options: Passed to HyperliquidInfo, e.g. ws_options.
+        """
+        self.address = address or os.getenv('ACCOUNT_ADDRESS')
+        self.reconcile_interval = reconcile_interval
+        meta_cache = info_options.get('meta_cache')
+        if spot_meta is None and meta_cache is not None:
+            # HyperliquidInfo shares the tables of the cache, the spot pairs come from the same load
+            _, pairs_meta = meta_cache.load()
+        else:
+            # Fetched once here and handed to HyperliquidInfo, which would otherwise fetch it again
+            spot_meta = spot_meta or API(base_url).post("/info", {"type": "spotMeta"})
+            pairs_meta = spot_meta
+        super().__init__(
+            base_url=base_url,
             skip_ws=False,
-            on_message_function=self.user_message
-        )
-        self.hyperliquid_stream.subscribe(
-            subscription={
-                "type": "userEvents",
-                "user": self.address,
-            },
-            callback=self.user_message,
-        )
-        self.hyperliquid_stream.subscribe(
-            subscription={
-                "type": "userFills",
-                "user": self.address,
-            },
-            callback=self.user_message,
-        )
-        self.hyperliquid_stream.subscribe(
-            subscription={
-                "type": "orderUpdates",
-                "user": self.address,
-            },
-            callback=self.user_message,
+            spot_meta=spot_meta,
+            on_message_function=self.user_message,
+            **info_options
         )
 
+        tokens = pairs_meta['tokens']
+        spot_pairs = {}
+        self.tokens = {}
+        for asset in pairs_meta['universe']:
+            base, quote = asset['tokens']
+            spot_pairs[asset['name']] = (tokens[base]['name'], tokens[quote]['name'])
+            self.tokens[asset['name']] = tokens[base]['name']
+        self.state = AccountState(self.address, spot_pairs, order_store=order_store)
+
+        for subscription_type in ("orderUpdates", "userFills", "userNonFundingLedgerUpdates"):
+            self.subscribe(
+                subscription={
+                    "type": subscription_type,
+                    "user": self.address,
+                },
+                callback=self.user_message,
+            )
+
         if order_update_function:
             self.order_update_function = order_update_function
         else:
@@ -52,69 +82,93 @@ class HyperliquidUserData(HyperliquidInfo):
             self.fills_update_function = fills_update_function
         else:
             self.fills_update_function = self.fills_updates
-    
-    async def user_message(self, message):
-        data = message['data']
-        if message["channel"] == 'orderUpdates':
+
+    @property
+    def balance(self):
+        """Token -> {"total", "free", "locked"}."""
+        return self.state.balances
+
+    @property
+    def orders(self):
+        """Oid -> open order."""
+        return self.state.open_orders
+
+    def user_message(self, message):
+        channel = message.get("channel")
+        data = message.get('data')
+        if channel == 'orderUpdates':
+            if message.get("isSnapshot"):
+                # Resync after a reconnect, the full list of open orders
+                self.state.replace_open_orders([update['order'] for update in data])
+            else:
+                self.state.apply_order_updates(data)
             self.order_update_function(data)
-        elif message["channel"] == 'userFills':
+        elif channel == 'userFills':
+            if data.get("isSnapshot") and not message.get("resync"):
+                # Fills before the subscription, already part of the snapshots
+                self.state.mark_fills_seen(data['fills'])
+            else:
+                self.state.apply_fills(data['fills'])
             self.fills_update_function(data)
-        print(message)
+        elif channel == 'userNonFundingLedgerUpdates':
+            if not data.get("isSnapshot"):
+                self.state.apply_ledger_updates(data['nonFundingLedgerUpdates'])
 
     def order_updates(self, data):
-        self.order_balance_update(data)
-        print(data)
-
-    def order_balance_update(self, data):
-        for order_update in data:
-            if order_update['status'] == 'canceled':
-                order = order_update['order']
-                if order['side'] == 'B':
-                    amount = float(order['limitPx']) * float(order['sz'])
-                    self.balance['USDC']['free'] += amount
-                    self.balance['USDC']['locked'] -= amount
-                self.orders.pop(order['oid'], None)
-                pass
-            elif order_update['status'] == 'open':
-                order = order_update['order']
-                self.orders[order['oid']] = {
-                    'side': order['side'],
-                    'price': order['limitPx'],
-                    'size': order['sz'],
-                    'filled': 0
-                }
-
-        print(data)
+        pass
 
     def fills_updates(self, data):
-        print(data)
+        pass
+
+    async def reconcile(self):
+        """
+        Replace the streamed state with REST snapshots of balances, positions and open orders.
+
+        Events received while the snapshots are requested are replayed on
+        top of them if they are newer than the time the server built the
+        clearinghouse state at, the local request time when it has none.
+
+        Returns:
+            dict: Drift of the streamed state, per token total and per coin position
+        """
+        self.state.begin_snapshot()
+        snapshot_time = get_timestamp_ms()
+        spot_state, perp_state, open_orders = await asyncio.gather(
+            self._rest(self.spot_user_state, self.address),
+            self._rest(self.user_state, self.address),
+            self._rest(self.frontend_open_orders, self.address),
+        )
+        drift = self.state.apply_snapshot(spot_state, perp_state, open_orders, snapshot_time)
+        if drift:
+            self._logger.warning(f"Account state drifted from snapshot: {drift}")
+        return drift
 
     async def fetch_balance(self):
-        balances = await self.hyperliquid_spot_info.get_account_balance(
-            self.address)
-        
-        self.balance = {}
-        for balance in balances['balances']:
-            self.balance[balance['coin']] = {
-                'free': float(balance['total']) - \
-                    float(balance['hold']),
-                'locked': float(balance['hold'])
-            }
-    
-    async def start(self):
-        await self.fetch_balance()
+        await self.reconcile()
 
-        spot_metadata = await self.hyperliquid_spot_info.get_metadata()
-        tokens = spot_metadata['tokens']
-        self.tokens = {}
-        for asset in spot_metadata['universe']:
-            self.tokens[asset['name']] = tokens[asset['tokens'][0]]['name']
+    async def _reconcile_loop(self):
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                self._logger.warning(f"Account state reconciliation failed: {e!r}")
 
-        await self.hyperliquid_stream.connect_websocket()
+    async def start(self):
+        websocket = asyncio.ensure_future(self.connect_websocket())
+        tasks = [websocket]
+        if self.reconcile_interval:
+            tasks.append(asyncio.ensure_future(self._reconcile_loop()))
+        try:
+            await self.reconcile()
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
 
 async def main():
     user_data = HyperliquidUserData()
     await user_data.start()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,311 @@
+import threading
+from collections import OrderedDict, defaultdict
+
+from hyperliquid.utils.types import Any, Dict, List, Optional, Tuple
+from utils.order_store import OPEN_STATUSES, OrderStore
+
+
+class AccountState():
+    def __init__(self,
+                 address: str,
+                 spot_pairs: Optional[Dict[str, Tuple[str, str]]] = None,
+                 max_seen_fills: int = 10000,
+                 order_store: Optional[OrderStore] = None):
+        """
+        Incrementally maintained account state of one user.
+
+        Balances (total, free and locked per spot token), perp positions and
+        open orders are updated in place by orderUpdates, fills and ledger
+        events, so every read is a dict lookup. apply_snapshot replaces the
+        state with REST snapshots and replays events that arrived while the
+        snapshots were being fetched.
+
+        Spot orders lock their quote token (buys, limit price x size) or base
+        token (sells, size) until they fill or are canceled. Perp orders lock
+        margin, which is only refreshed by snapshots.
+
+        Args:
+            address (str): User address, used to orient transfers.
+            spot_pairs (dict): Spot coin (e.g. "PURR/USDC" or "@107") -> (base token, quote token).
+            max_seen_fills (int): Number of fill tids remembered to drop duplicates.
+            order_store (OrderStore): Store of the open orders, e.g. shared with an Exchange.
+        """
+        self.address = address.lower()
+        self.spot_pairs = spot_pairs or {}
+        self.max_seen_fills = max_seen_fills
+
+        # token -> {"total", "free", "locked"}
+        self.balances: Dict[str, Dict[str, float]] = defaultdict(lambda: {"total": 0.0, "free": 0.0, "locked": 0.0})
+        # coin -> {"szi", "entry_px"}, szi is negative for shorts
+        self.positions: Dict[str, Dict[str, float]] = {}
+        self.order_store = order_store or OrderStore()
+        # oid -> (token, amount locked, amount per unit of size) of resting spot orders
+        self._locks: Dict[int, Tuple[str, float, float]] = {}
+        # Perp account summary of the last snapshot
+        self.margin_summary: Dict[str, Any] = {}
+        self.withdrawable = 0.0
+        self.realized_pnl = 0.0
+        self.fees_paid = 0.0
+
+        self.snapshot_time = 0
+        self.unhandled_ledger_updates = 0
+        self._seen_fills: "OrderedDict[Any, None]" = OrderedDict()
+        # Events applied since begin_snapshot, replayed on top of the snapshot
+        self._journal: Optional[List[Tuple[str, Any]]] = None
+        self._lock = threading.RLock()
+
+    def free(self, token: str) -> float:
+        balance = self.balances.get(token)
+        return balance["free"] if balance else 0.0
+
+    def locked(self, token: str) -> float:
+        balance = self.balances.get(token)
+        return balance["locked"] if balance else 0.0
+
+    def position(self, coin: str) -> float:
+        position = self.positions.get(coin)
+        return position["szi"] if position else 0.0
+
+    @property
+    def open_orders(self) -> Dict[int, Dict[str, Any]]:
+        """Oid -> open order, see OrderStore."""
+        return self.order_store.by_oid
+
+    def _adjust(self, token: str, total: float = 0.0, locked: float = 0.0):
+        balance = self.balances[token]
+        balance["total"] += total
+        # Never lock more than was locked, an order can be released by its status and its fills
+        balance["locked"] = max(0.0, balance["locked"] + locked)
+        balance["free"] = balance["total"] - balance["locked"]
+
+    def _set_lock(self, oid: int, order: Optional[Dict[str, Any]], adjust: bool = True):
+        """Lock what the remaining size of a spot order needs, release the lock of a closed order (None)."""
+        token, locked, _ = self._locks.pop(oid, (None, 0.0, 0.0))
+        if adjust and token is not None:
+            self._adjust(token, locked=-locked)
+        pair = self.spot_pairs.get(order["coin"]) if order is not None else None
+        if pair is None:
+            return
+        base, quote = pair
+        token, per_unit = (quote, order["price"]) if order["side"] == "B" else (base, 1.0)
+        self._locks[oid] = (token, per_unit * order["size"], per_unit)
+        if adjust:
+            self._adjust(token, locked=per_unit * order["size"])
+
+    def _journaled(self, kind: str, payload: Any):
+        if self._journal is not None:
+            self._journal.append((kind, payload))
+
+    def apply_order_updates(self, updates: List[Dict[str, Any]]):
+        """Apply orderUpdates entries: open and triggered orders rest, every other status removes the order."""
+        with self._lock:
+            self._journaled("orders", updates)
+            for update in updates:
+                if update.get("statusTimestamp", 0) <= self.snapshot_time:
+                    continue
+                oid = update["order"]["oid"]
+                if update["status"] in OPEN_STATUSES:
+                    self._set_lock(oid, self.order_store.upsert_wire(update["order"]))
+                else:
+                    self.order_store.remove(oid)
+                    self._set_lock(oid, None)
+
+    def replace_open_orders(self, orders: List[Dict[str, Any]]):
+        """Replace the open orders with a full list (REST or an isSnapshot orderUpdates), moving locks accordingly."""
+        with self._lock:
+            for oid in list(self._locks):
+                self._set_lock(oid, None)
+            self.order_store.replace(orders)
+            for oid, order in self.order_store.by_oid.items():
+                self._set_lock(oid, order)
+
+    def _seen(self, fill: Dict[str, Any]) -> bool:
+        key = fill.get("tid", (fill.get("hash"), fill.get("oid"), fill.get("time")))
+        if key in self._seen_fills:
+            return True
+        self._seen_fills[key] = None
+        if len(self._seen_fills) > self.max_seen_fills:
+            self._seen_fills.popitem(last=False)
+        return False
+
+    def apply_fills(self, fills: List[Dict[str, Any]]):
+        """Apply fills (userFills or userEvents), duplicates by tid and fills older than the snapshot are ignored."""
+        with self._lock:
+            accepted = [fill for fill in fills if fill["time"] > self.snapshot_time and not self._seen(fill)]
+            # Journal only the accepted fills, a duplicate would otherwise be replayed twice by apply_snapshot
+            self._journaled("fills", accepted)
+            for fill in accepted:
+                self._apply_fill(fill)
+
+    def mark_fills_seen(self, fills: List[Dict[str, Any]]):
+        """Remember historical fills (the isSnapshot message of userFills) without applying them."""
+        with self._lock:
+            for fill in fills:
+                self._seen(fill)
+
+    def _apply_fill(self, fill: Dict[str, Any]):
+        coin = fill["coin"]
+        px = float(fill["px"])
+        sz = float(fill["sz"])
+        is_buy = fill["side"] == "B"
+        fee = float(fill.get("fee", 0))
+        self.fees_paid += fee
+        oid = fill.get("oid")
+        lock = self._locks.get(oid)
+        if lock is not None:
+            token, locked, per_unit = lock
+            release = min(locked, per_unit * sz)
+            self._adjust(token, locked=-release)
+            self._locks[oid] = (token, locked - release, per_unit)
+        order = self.order_store.get(oid)
+        if order is not None:
+            order["size"] -= sz
+            if order["size"] <= 0:
+                self.order_store.remove(oid)
+                self._set_lock(oid, None)
+
+        pair = self.spot_pairs.get(coin)
+        if pair is not None:
+            base, quote = pair
+            self._adjust(base, total=sz if is_buy else -sz)
+            self._adjust(quote, total=-px * sz if is_buy else px * sz)
+            self._adjust(fill.get("feeToken") or quote, total=-fee)
+            return
+
+        self.realized_pnl += float(fill.get("closedPnl", 0))
+        position = self.positions.setdefault(coin, {"szi": 0.0, "entry_px": 0.0})
+        szi = position["szi"]
+        delta = sz if is_buy else -sz
+        new_szi = szi + delta
+        if szi == 0 or (szi > 0) == (delta > 0):
+            # Opening or adding, the entry price is the size weighted average
+            position["entry_px"] = (position["entry_px"] * abs(szi) + px * sz) / abs(new_szi)
+        elif new_szi != 0 and (new_szi > 0) != (szi > 0):
+            # Flipped through zero, the remainder was opened at this fill
+            position["entry_px"] = px
+        position["szi"] = new_szi
+        if new_szi == 0:
+            del self.positions[coin]
+
+    def apply_ledger_updates(self, updates: List[Dict[str, Any]]):
+        """
+        Apply userNonFundingLedgerUpdates entries that move spot balances.
+
+        Perp side movements (deposits, withdrawals, internal transfers) change
+        margin, which is refreshed by the next snapshot; they are counted in
+        unhandled_ledger_updates like unknown delta types.
+        """
+        with self._lock:
+            self._journaled("ledger", updates)
+            for update in updates:
+                if update["time"] <= self.snapshot_time:
+                    continue
+                delta = update["delta"]
+                kind = delta.get("type")
+                if kind == "accountClassTransfer":
+                    usdc = float(delta["usdc"])
+                    self._adjust("USDC", total=-usdc if delta["toPerp"] else usdc)
+                elif kind == "spotTransfer":
+                    amount = float(delta["amount"])
+                    if delta.get("user", "").lower() == self.address:
+                        self._adjust(delta["token"], total=-amount)
+                    if delta.get("destination", "").lower() == self.address:
+                        self._adjust(delta["token"], total=amount)
+                elif kind == "spotGenesis":
+                    self._adjust(delta["token"], total=float(delta["amount"]))
+                else:
+                    self.unhandled_ledger_updates += 1
+
+    def begin_snapshot(self):
+        """Start journaling events, call before requesting the snapshots passed to apply_snapshot."""
+        with self._lock:
+            self._journal = []
+
+    def apply_snapshot(self,
+                       spot_state: Optional[Dict[str, Any]],
+                       perp_state: Optional[Dict[str, Any]],
+                       open_orders: Optional[List[Dict[str, Any]]],
+                       snapshot_time: int) -> Dict[str, float]:
+        """
+        Replace the state with REST snapshots, then replay the events journaled since begin_snapshot.
+
+        Args:
+            spot_state (dict): spot_user_state response.
+            perp_state (dict): user_state response.
+            open_orders (list): frontend_open_orders or open_orders response.
+            snapshot_time (int): Time in ms the snapshots were requested at, replayed events must be newer.
+                The time of perp_state, when the server sent one, is used instead.
+
+        Returns:
+            dict: Drift between the streamed and the snapshot state, per token total and per coin position,
+                empty for the first snapshot
+        """
+        with self._lock:
+            if perp_state is not None and perp_state.get("time"):
+                # When the server built the snapshot, events up to it are already part of it
+                snapshot_time = int(perp_state["time"])
+            drift: Dict[str, float] = {}
+            first = self.snapshot_time == 0
+            journal = self._journal or []
+            self._journal = None
+            if spot_state is not None:
+                balances = {balance["coin"]: float(balance["total"]) for balance in spot_state["balances"]}
+                for token in set(balances) | set(self.balances):
+                    difference = balances.get(token, 0.0) - self.balances.get(token, {}).get("total", 0.0)
+                    if not first and abs(difference) > 1e-9:
+                        drift[token] = difference
+                self.balances.clear()
+                for balance in spot_state["balances"]:
+                    total = float(balance["total"])
+                    locked = float(balance["hold"])
+                    self.balances[balance["coin"]] = {"total": total, "free": total - locked, "locked": locked}
+            if perp_state is not None:
+                positions = {}
+                for asset_position in perp_state["assetPositions"]:
+                    position = asset_position["position"]
+                    szi = float(position["szi"])
+                    if szi != 0:
+                        positions[position["coin"]] = {"szi": szi, "entry_px": float(position["entryPx"] or 0)}
+                for coin in set(positions) | set(self.positions):
+                    difference = positions.get(coin, {"szi": 0.0})["szi"] - self.position(coin)
+                    if not first and abs(difference) > 1e-9:
+                        drift[coin] = difference
+                self.positions = positions
+                self.margin_summary = perp_state.get("marginSummary", {})
+                self.withdrawable = float(perp_state.get("withdrawable", 0))
+            if open_orders is not None:
+                self.order_store.replace(open_orders)
+                # Snapshot holds already include the open orders
+                self._locks.clear()
+                for oid, order in self.order_store.by_oid.items():
+                    self._set_lock(oid, order, adjust=False)
+            self.snapshot_time = snapshot_time
+            for kind, payload in journal:
+                if kind == "orders":
+                    self.apply_order_updates(payload)
+                elif kind == "fills":
+                    # Only fills accepted by apply_fills are journaled, each tid is replayed once
+                    for fill in payload:
+                        if fill["time"] > snapshot_time:
+                            self._apply_fill(fill)
+                else:
+                    self.apply_ledger_updates(payload)
+            return drift
+
+
+def main():
+    # A fill delivered twice while a snapshot is fetched, e.g. a resync userFills overlapping the live one,
+    # is applied once and replayed once
+    state = AccountState("0x0000000000000000000000000000000000000001", {"PURR/USDC": ("PURR", "USDC")})
+    state.apply_snapshot({"balances": []}, None, [], 1000)
+    state.begin_snapshot()
+    fill = {"coin": "PURR/USDC", "px": "1", "sz": "10", "side": "B", "time": 1600, "tid": 7, "fee": "0"}
+    state.apply_fills([fill])
+    state.apply_fills([dict(fill)])
+    state.apply_snapshot({"balances": []}, None, [], 1500)
+    assert state.balances["PURR"]["total"] == 10.0, state.balances["PURR"]
+    print(dict(state.balances))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only needed for array decoding
+    np = None
+
+from hyperliquid.utils.types import L2Level, List, Optional, Trade, Tuple
+
+L2_LEVEL_FIELDS = [("px", "f8"), ("sz", "f8"), ("n", "i8")]
+# side is +1 for buys ("B") and -1 for sells ("A")
+TRADE_FIELDS = [("px", "f8"), ("sz", "f8"), ("side", "i1"), ("time", "i8"), ("tid", "i8")]
+CANDLE_FIELDS = [
+    ("t", "i8"), ("T", "i8"), ("o", "f8"), ("h", "f8"), ("l", "f8"), ("c", "f8"), ("v", "f8"), ("n", "i8")
+]
+ARRAY_CHANNELS = ("l2Book", "trades", "candle")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for array decoding, install it with `pip install numpy`")
+
+
+def _to_array(rows: List[dict], fields) -> "np.ndarray":
+    _require_numpy()
+    array = np.empty(len(rows), dtype=fields)
+    # Assigning the decimal strings column by column lets numpy parse them in C
+    for name, _ in fields:
+        array[name] = [row[name] for row in rows]
+    return array
+
+
+def l2_levels_to_array(levels: List[L2Level]) -> "np.ndarray":
+    """
+    Convert one side of an l2Book payload to a structured array.
+
+    Args:
+        levels (list): Levels as {px, sz, n} dicts.
+
+    Returns:
+        np.ndarray: Structured array with px, sz and n fields, in input order (best first)
+    """
+    return _to_array(levels, L2_LEVEL_FIELDS)
+
+
+def l2_book_to_arrays(data: dict) -> dict:
+    """
+    Convert l2Book data (websocket or l2_snapshot) so that levels is a (bids, asks) pair of arrays.
+
+    Args:
+        data (dict): l2Book data with coin, time and levels.
+
+    Returns:
+        dict: Same payload with levels replaced by structured arrays
+    """
+    bids, asks = data["levels"]
+    return {"coin": data["coin"], "time": data["time"], "levels": (l2_levels_to_array(bids), l2_levels_to_array(asks))}
+
+
+def trades_to_array(trades: List[Trade]) -> "np.ndarray":
+    """
+    Convert trades to a structured array with px, sz, side (+1 buy, -1 sell), time and tid fields.
+
+    Args:
+        trades (list): Trades as received on the trades channel.
+
+    Returns:
+        np.ndarray: Structured array of the trades
+    """
+    _require_numpy()
+    array = np.empty(len(trades), dtype=TRADE_FIELDS)
+    array["px"] = [trade["px"] for trade in trades]
+    array["sz"] = [trade["sz"] for trade in trades]
+    array["side"] = [1 if trade["side"] == "B" else -1 for trade in trades]
+    array["time"] = [trade["time"] for trade in trades]
+    array["tid"] = [trade.get("tid", 0) for trade in trades]
+    return array
+
+
+def candles_to_array(candles: List[dict]) -> "np.ndarray":
+    """
+    Convert candles (candles_snapshot or candle channel) to a structured array.
+
+    Args:
+        candles (list): Candles with t, T, o, h, l, c, v and n keys.
+
+    Returns:
+        np.ndarray: Structured array of the candles
+    """
+    return _to_array(candles, CANDLE_FIELDS)
+
+
+def decode_ws_msg(ws_msg: dict) -> dict:
+    """
+    Replace the data of l2Book, trades and candle messages by structured arrays.
+
+    Other top-level keys (e.g. the resync flag of REST snapshots) are kept,
+    other channels are returned unchanged.
+
+    Args:
+        ws_msg (dict): Decoded websocket message.
+
+    Returns:
+        dict: Message with array data
+    """
+    channel = ws_msg.get("channel")
+    if channel == "l2Book":
+        return dict(ws_msg, data=l2_book_to_arrays(ws_msg["data"]))
+    elif channel == "trades":
+        return dict(ws_msg, data=trades_to_array(ws_msg["data"]))
+    elif channel == "candle":
+        return dict(ws_msg, data=candles_to_array([ws_msg["data"]]))
+    return ws_msg
+
+
+def vwap(array: "np.ndarray") -> Optional[float]:
+    """Volume weighted average price of levels or trades."""
+    total = array["sz"].sum()
+    if total == 0:
+        return None
+    return float((array["px"] * array["sz"]).sum() / total)
+
+
+def book_imbalance(bids: "np.ndarray", asks: "np.ndarray", depth: Optional[int] = None) -> Optional[float]:
+    """
+    Size imbalance of the top depth levels, in [-1, 1], positive when bids outweigh asks.
+
+    Args:
+        bids (np.ndarray): Bid levels best first.
+        asks (np.ndarray): Ask levels best first.
+        depth (int): Number of levels per side, defaults to all.
+
+    Returns:
+        float: (bid size - ask size) / (bid size + ask size)
+    """
+    bid_sz = bids["sz"][:depth].sum()
+    ask_sz = asks["sz"][:depth].sum()
+    if bid_sz + ask_sz == 0:
+        return None
+    return float((bid_sz - ask_sz) / (bid_sz + ask_sz))
+
+
+def cumulative_depth(levels: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Cumulative size and notional of levels, best first.
+
+    Returns:
+        tuple: (cumulative size, cumulative notional)
+    """
+    return np.cumsum(levels["sz"]), np.cumsum(levels["px"] * levels["sz"])
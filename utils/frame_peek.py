@@ -0,0 +1,69 @@
+import re
+
+from hyperliquid.utils.types import Optional
+
+# Channels carrying subscription data, everything else (pong, subscriptionResponse, error, ...) is control traffic
+DATA_CHANNELS = frozenset([
+    "allMids", "l2Book", "trades", "user", "userFills", "candle", "orderUpdates", "userFundings",
+    "userNonFundingLedgerUpdates", "webData2",
+])
+# Control frames nobody subscribes to
+SKIP_CHANNELS = frozenset(["pong", "subscriptionResponse"])
+# Subscription types whose message channel has a different name
+TYPE_TO_CHANNEL = {"userEvents": "user"}
+
+_CHANNEL_PREFIX = '{"channel":"'
+_CHANNEL_RE = re.compile(r'"channel"\s*:\s*"([^"]*)"')
+_COIN_RE = re.compile(r'"coin"\s*:\s*"([^"]*)"')
+_CANDLE_RE = re.compile(r'"([si])"\s*:\s*"([^"]*)"')
+
+
+def subscription_channel(subscription_type: str) -> str:
+    return TYPE_TO_CHANNEL.get(subscription_type, subscription_type)
+
+
+def peek_channel(frame) -> Optional[str]:
+    """
+    Read the channel of a raw websocket frame without decoding it.
+
+    Hyperliquid sends the channel as the first key, which is checked first; other layouts fall back to a regex.
+
+    Args:
+        frame (str): Raw text frame.
+
+    Returns:
+        str: Channel, or None if the frame is not text or has no channel
+    """
+    if not isinstance(frame, str):
+        return None
+    if frame.startswith(_CHANNEL_PREFIX):
+        end = frame.find('"', len(_CHANNEL_PREFIX))
+        if end != -1:
+            return frame[len(_CHANNEL_PREFIX):end]
+    match = _CHANNEL_RE.search(frame)
+    return match.group(1) if match else None
+
+
+def peek_identifier(frame: str, channel: str) -> Optional[str]:
+    """
+    Routing identifier of a coin keyed frame, matching WebsocketManager.ws_msg_to_identifier.
+
+    Only l2Book, trades and candle frames are peeked: their coin (and interval) appears once, or identically in every
+    trade. User channels can nest other addresses, so they return None and are routed after decoding.
+
+    Args:
+        frame (str): Raw text frame.
+        channel (str): Channel returned by peek_channel.
+
+    Returns:
+        str: Identifier, or None if it can not be read reliably without decoding
+    """
+    if channel == "l2Book" or channel == "trades":
+        match = _COIN_RE.search(frame)
+        return f"{channel}:{match.group(1).lower()}" if match else None
+    if channel == "candle":
+        fields = dict(_CANDLE_RE.findall(frame))
+        if "s" not in fields or "i" not in fields:
+            return None
+        return f'candle:{fields["s"].lower()},{fields["i"]}'
+    return None
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+
+from hyperliquid.utils.types import Any, Callable, Dict, Iterable, Optional, Union
+
+PING_MESSAGE = {"method": "ping"}
+
+
+class Heartbeat():
+    def __init__(self,
+                 interval: Optional[float] = 20,
+                 pong_timeout: Optional[float] = None,
+                 stale_after: Union[None, float, Dict[str, float]] = None,
+                 stale_action: str = "reconnect",
+                 on_stale: Optional[Callable[[str, float], Any]] = None,
+                 logger=None):
+        """
+        Application level ping/pong and stale subscription watchdog of one websocket connection.
+
+        Every interval seconds a {"method": "ping"} is sent and the time to
+        the matching pong is recorded. A ping left unanswered for
+        pong_timeout seconds, or a subscription without a message for longer
+        than its stale_after threshold, marks the connection as unhealthy.
+
+        Args:
+            interval (float): Seconds between pings, None disables the heartbeat.
+            pong_timeout (float): Seconds to wait for a pong, defaults to interval.
+            stale_after (float | dict): Seconds of silence after which a subscription is stale, either for every
+                subscription or per channel (subscription type), e.g. {"l2Book": 5, "allMids": 5}.
+            stale_action (str): "reconnect" to force a reconnect when a subscription goes stale, "report" to only
+                log it and call on_stale.
+            on_stale (callable): Called with (identifier, seconds since its last message) for stale subscriptions.
+        """
+        if stale_action not in ("reconnect", "report"):
+            raise ValueError(f"Unknown stale action {stale_action}")
+        self.interval = interval
+        self.pong_timeout = pong_timeout or interval
+        self.stale_after = stale_after
+        self.stale_action = stale_action
+        self.on_stale = on_stale
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.pings_sent = 0
+        self.pongs_received = 0
+        self.missed_pongs = 0
+        self.stale_reports = 0
+        self.pauses = 0
+        self.latencies_ms: "deque[float]" = deque(maxlen=100)
+        # Monotonic time of the last message per identifier
+        self.last_message_at: Dict[str, float] = {}
+        self._ping_sent_at: Optional[float] = None
+        self._connected_at = time.monotonic()
+        self._paused = 0
+
+    def on_connect(self):
+        self._ping_sent_at = None
+        self._connected_at = time.monotonic()
+        self.last_message_at.clear()
+
+    def on_message(self, identifier: str):
+        self.last_message_at[identifier] = time.monotonic()
+
+    def on_pong(self):
+        if self._ping_sent_at is None:
+            return
+        self.pongs_received += 1
+        self.latencies_ms.append((time.monotonic() - self._ping_sent_at) * 1000)
+        self._ping_sent_at = None
+
+    def pause(self):
+        """Stop judging the connection, e.g. while the receive loop waits for queue room and reads no frame."""
+        self._paused += 1
+        self.pauses += 1
+
+    def resume(self):
+        """Judge the connection again, restarting every clock since frames, pongs included, were left unread."""
+        self._paused -= 1
+        if self._paused:
+            return
+        now = time.monotonic()
+        self._ping_sent_at = None
+        self._connected_at = now
+        for identifier in self.last_message_at:
+            self.last_message_at[identifier] = now
+
+    def _threshold(self, identifier: str) -> Optional[float]:
+        if isinstance(self.stale_after, dict):
+            return self.stale_after.get(identifier.split(":", 1)[0])
+        return self.stale_after
+
+    def stale_subscriptions(self, identifiers: Iterable[str]) -> Dict[str, float]:
+        """Identifiers silent for longer than their threshold, with the seconds since their last message."""
+        now = time.monotonic()
+        stale = {}
+        for identifier in identifiers:
+            threshold = self._threshold(identifier)
+            if threshold is None:
+                continue
+            age = now - self.last_message_at.get(identifier, self._connected_at)
+            if age > threshold:
+                stale[identifier] = age
+        return stale
+
+    async def run(self,
+                  send: Callable[[Any], Any],
+                  identifiers: Callable[[], Iterable[str]]) -> str:
+        """
+        Ping and watch the connection until it becomes unhealthy.
+
+        Args:
+            send (callable): Coroutine function sending a message on the connection.
+            identifiers (callable): Returns the identifiers of the connection's subscriptions.
+
+        Returns:
+            str: Why the connection should be reconnected
+        """
+        periods = [period for period in (self.interval, self._smallest_threshold()) if period]
+        if not periods:
+            await asyncio.Future()
+        tick = min(periods) / 2
+        next_ping = time.monotonic()
+        while True:
+            if self._paused:
+                await asyncio.sleep(tick)
+                continue
+            now = time.monotonic()
+            if self._ping_sent_at is not None and now - self._ping_sent_at > self.pong_timeout:
+                self.missed_pongs += 1
+                self._ping_sent_at = None
+                return f"no pong within {self.pong_timeout}s"
+            if self.interval and now >= next_ping and self._ping_sent_at is None:
+                self._ping_sent_at = now
+                self.pings_sent += 1
+                next_ping = now + self.interval
+                await send(PING_MESSAGE)
+            stale = self.stale_subscriptions(identifiers())
+            for identifier, age in stale.items():
+                self.stale_reports += 1
+                self.logger.warning(f"Subscription {identifier} stale, no message for {age:.1f}s")
+                # Restart the clock so a quiet subscription is reported once per threshold
+                self.last_message_at[identifier] = now
+                if self.on_stale is not None:
+                    self.on_stale(identifier, age)
+            if stale and self.stale_action == "reconnect":
+                return f"stale subscriptions {sorted(stale)}"
+            await asyncio.sleep(tick)
+
+    def _smallest_threshold(self) -> Optional[float]:
+        if isinstance(self.stale_after, dict):
+            return min(self.stale_after.values(), default=None)
+        return self.stale_after
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "pings_sent": self.pings_sent,
+            "pongs_received": self.pongs_received,
+            "missed_pongs": self.missed_pongs,
+            "stale_reports": self.stale_reports,
+            "pauses": self.pauses,
+            "last_pong_latency_ms": self.latencies_ms[-1] if self.latencies_ms else None,
+            "median_pong_latency_ms": statistics.median(latencies) if latencies else None,
+            "max_pong_latency_ms": latencies[-1] if latencies else None,
+        }
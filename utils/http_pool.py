@@ -0,0 +1,167 @@
+import asyncio
+import threading
+
+import aiohttp
+
+
+class HyperHttpPool:
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 32,
+                 keepalive_timeout: float = 30,
+                 ttl_dns_cache: int = 300,
+                 timeout: float = 10):
+        """
+        Long-lived aiohttp connection pool shared by the info clients.
+
+        aiohttp sessions are bound to the event loop they were created on, so
+        the pool keeps one session per running loop and creates it lazily on
+        first use. Closing the pool only drops the session of the current loop;
+        the next request transparently opens a new one.
+
+        Args:
+            limit (int): Total number of simultaneous connections.
+            limit_per_host (int): Simultaneous connections to the same host.
+            keepalive_timeout (float): Seconds an idle connection is kept open.
+            ttl_dns_cache (int): Seconds a DNS resolution is cached.
+            timeout (float): Default total timeout of a request in seconds.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = timeout
+        self.headers = {
+            "Content-Type": "application/json",
+        }
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.ttl_dns_cache)
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the session bound to the running event loop, creating it if needed.
+
+        Returns:
+            aiohttp.ClientSession: Pooled session for the current loop
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                # Forget sessions whose loop is gone, they can not be reused
+                for other_loop in [l for l in self._sessions if l.is_closed()]:
+                    del self._sessions[other_loop]
+                session = self._create_session()
+                self._sessions[loop] = session
+            return session
+
+    async def post(self, url: str, params, timeout: float = None):
+        """
+        POST a JSON payload through the pooled session.
+
+        Args:
+            url (str): Full url of the endpoint.
+            params (dict): JSON payload.
+            timeout (float): Optional per-request timeout in seconds.
+
+        Returns:
+            dict | list | str: Decoded JSON body, or raw text if not JSON
+        """
+        session = self.get_session()
+        # Only override the session wide timeout when asked to, aiohttp treats None as "no timeout"
+        kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+        async with session.post(url=url, json=params, **kwargs) as response:
+            if response.content_type == 'application/json':
+                return await response.json()
+            else:
+                return await response.text()
+
+    async def close(self):
+        """Close the session bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> HyperHttpPool:
+    """
+    Return the process wide pool used by clients that are not given one.
+
+    Returns:
+        HyperHttpPool: Shared connection pool
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = HyperHttpPool()
+        return _default_pool
+
+
+def configure_default_pool(**kwargs) -> HyperHttpPool:
+    """
+    Replace the process wide pool with one built from the given settings.
+
+    Must be called before the first request, sessions already opened on the
+    previous pool are left to their owners to close.
+
+    Args:
+        **kwargs: Keyword arguments forwarded to HyperHttpPool.
+
+    Returns:
+        HyperHttpPool: The new shared connection pool
+    """
+    global _default_pool
+    with _default_pool_lock:
+        _default_pool = HyperHttpPool(**kwargs)
+        return _default_pool
+
+
+class HyperInfoClient:
+    def __init__(self,
+                 base_url: str = 'https://api.hyperliquid.xyz',
+                 pool: HyperHttpPool = None,
+                 pool_options: dict = None):
+        """
+        Base class of the async info clients, requests go through a shared pool.
+
+        Args:
+            base_url (str): Api url, defaults to mainnet.
+            pool (HyperHttpPool): Connection pool, defaults to the process wide one.
+            pool_options (dict): Settings of a pool of its own, created instead of using the shared one.
+        """
+        self.url = base_url + '/info'
+        # Only a pool created here is closed with the client, a shared one is closed by its owner
+        self._owns_pool = pool is None and pool_options is not None
+        self.pool = HyperHttpPool(**pool_options) if self._owns_pool else pool or get_default_pool()
+
+    async def _call(self, params):
+        return await self.pool.post(self.url, params)
+
+    async def close(self):
+        """Close the pool of the client if it created it, the shared pool is left to HyperHttpPool.close."""
+        if self._owns_pool:
+            await self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
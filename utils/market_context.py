@@ -0,0 +1,73 @@
+import time
+
+from hyperliquid.utils.types import Any, Dict, List, Optional
+
+
+class MarketContext():
+    def __init__(self,
+                 user: Optional[str] = None,
+                 max_age: float = 2.0):
+        """
+        Latest mids and positions, kept current by the allMids and webData2 subscriptions.
+
+        Exchange reads market_open, market_close and slippage prices from it
+        instead of calling all_mids and user_state before every order. Reads
+        return None when the data is missing or older than max_age, the
+        caller then falls back to REST.
+
+        Args:
+            user (str): Address whose webData2 feeds the positions, None for mids only.
+            max_age (float): Seconds after which mids and positions are stale.
+        """
+        self.user = user.lower() if user else None
+        self.max_age = max_age
+        # Replaced, never mutated, so readers on other threads need no lock
+        self.mids: Dict[str, str] = {}
+        self.positions: Dict[str, float] = {}
+        self.margin_summary: Dict[str, Any] = {}
+        self.mids_updated_at: Optional[float] = None
+        self.positions_updated_at: Optional[float] = None
+
+    def subscribe(self, info) -> List[int]:
+        """Subscribe to allMids, and webData2 of user when set, on a HyperliquidInfo with a websocket."""
+        subscription_ids = [info.subscribe({"type": "allMids"}, self.on_all_mids)]
+        if self.user is not None:
+            subscription_ids.append(info.subscribe({"type": "webData2", "user": self.user}, self.on_web_data2))
+        return subscription_ids
+
+    def on_all_mids(self, ws_msg: Any):
+        self.mids = ws_msg["data"]["mids"]
+        self.mids_updated_at = time.monotonic()
+
+    def on_web_data2(self, ws_msg: Any):
+        state = ws_msg["data"]["clearinghouseState"]
+        self.positions = {
+            asset_position["position"]["coin"]: float(asset_position["position"]["szi"])
+            for asset_position in state["assetPositions"]
+        }
+        self.margin_summary = state.get("marginSummary", {})
+        self.positions_updated_at = time.monotonic()
+
+    def _fresh(self, updated_at: Optional[float], max_age: Optional[float]) -> bool:
+        max_age = self.max_age if max_age is None else max_age
+        return updated_at is not None and time.monotonic() - updated_at <= max_age
+
+    def mid(self, coin: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Mid price of coin, None if unknown or stale."""
+        if not self._fresh(self.mids_updated_at, max_age):
+            return None
+        mid = self.mids.get(coin)
+        return float(mid) if mid is not None else None
+
+    def position(self, coin: str, user: Optional[str] = None, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Signed position size of coin, 0 without a position.
+
+        Returns:
+            float: Size, None if the positions are stale or belong to another user than user
+        """
+        if user is not None and user.lower() != self.user:
+            return None
+        if not self._fresh(self.positions_updated_at, max_age):
+            return None
+        return self.positions.get(coin, 0.0)
@@ -0,0 +1,150 @@
+import asyncio
+from collections import defaultdict, deque
+
+from hyperliquid.utils.types import Any, Dict, List, Optional, Tuple
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+POLICIES = (BLOCK, DROP_OLDEST, COALESCE)
+
+# Channels whose messages are full snapshots, only the newest one per key matters
+DEFAULT_CHANNEL_POLICIES = {
+    "allMids": COALESCE,
+    "l2Book": COALESCE,
+    "webData2": COALESCE,
+}
+
+
+class BoundedMessageQueue:
+    def __init__(self,
+                 maxsize: int = 10000,
+                 channel_policies: Optional[Dict[str, str]] = None,
+                 default_policy: str = BLOCK):
+        """
+        Bounded asyncio queue of websocket messages with a policy per channel.
+
+        block: put waits for room, which stops reading the socket (backpressure).
+        drop_oldest: when full, the oldest queued message of a non-blocking
+            channel is dropped to make room; if there is none the new message
+            is dropped.
+        coalesce: a message replaces the queued message with the same key in
+            place, so a slow consumer only sees the latest snapshot per key.
+            When full and the key is not queued it behaves like drop_oldest.
+
+        Args:
+            maxsize (int): Maximum number of queued messages.
+            channel_policies (dict): Policy per channel, defaults to DEFAULT_CHANNEL_POLICIES.
+            default_policy (str): Policy of channels missing from channel_policies.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.channel_policies = DEFAULT_CHANNEL_POLICIES if channel_policies is None else channel_policies
+        self.default_policy = default_policy
+        for policy in list(self.channel_policies.values()) + [default_policy]:
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown queue policy {policy}")
+
+        # Entries are [channel, key, message] lists so coalescing can swap the message in place
+        self._entries: "deque[List[Any]]" = deque()
+        self._pending: Dict[Any, List[Any]] = {}
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+        self.max_depth = 0
+        self.dropped: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+
+    def policy(self, channel: str) -> str:
+        return self.channel_policies.get(channel, self.default_policy)
+
+    def qsize(self) -> int:
+        return len(self._entries)
+
+    def full(self) -> bool:
+        return len(self._entries) >= self.maxsize
+
+    def _append(self, entry: List[Any], coalesce: bool = False):
+        self._entries.append(entry)
+        if coalesce:
+            self._pending[entry[1]] = entry
+        if len(self._entries) > self.max_depth:
+            self.max_depth = len(self._entries)
+        if len(self._entries) >= self.maxsize:
+            self._not_full.clear()
+        self._not_empty.set()
+
+    def _evict_oldest(self) -> bool:
+        for index, entry in enumerate(self._entries):
+            if self.policy(entry[0]) != BLOCK:
+                del self._entries[index]
+                if entry[1] is not None and self._pending.get(entry[1]) is entry:
+                    del self._pending[entry[1]]
+                self.dropped[entry[0]] += 1
+                return True
+        return False
+
+    def put_nowait(self, channel: str, message: Any, key: Any = None) -> bool:
+        """
+        Queue a message without waiting, applying the channel's policy when full.
+
+        Args:
+            channel (str): Channel of the message, selects the policy.
+            message: Message to queue.
+            key: Routing key, e.g. the subscription identifier, messages of coalescing
+                channels are coalesced per key.
+
+        Returns:
+            bool: False if the message was dropped
+        """
+        coalesce = key is not None and self.policy(channel) == COALESCE
+        if coalesce:
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry[2] = message
+                self.coalesced[channel] += 1
+                return True
+        if self.full() and not self._evict_oldest():
+            self.dropped[channel] += 1
+            return False
+        self._append([channel, key, message], coalesce)
+        return True
+
+    async def put(self, channel: str, message: Any, key: Any = None) -> bool:
+        """Queue a message, waiting for room if the channel's policy is block."""
+        if self.policy(channel) == BLOCK:
+            while self.full():
+                await self._not_full.wait()
+            self._append([channel, key, message])
+            return True
+        return self.put_nowait(channel, message, key)
+
+    async def get(self) -> Tuple[Any, Any]:
+        """
+        Remove and return the oldest message.
+
+        Returns:
+            tuple: (key, message) as passed to put
+        """
+        while not self._entries:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        entry = self._entries.popleft()
+        _, key, message = entry
+        if key is not None and self._pending.get(key) is entry:
+            del self._pending[key]
+        if not self._entries:
+            self._not_empty.clear()
+        self._not_full.set()
+        return key, message
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self._entries),
+            "max_depth": self.max_depth,
+            "maxsize": self.maxsize,
+            "dropped": dict(self.dropped),
+            "coalesced": dict(self.coalesced),
+        }
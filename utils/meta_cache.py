@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from hyperliquid.api import API
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.types import Any, Dict, Meta, Optional, SpotMeta, Tuple
+from hyperliquid.utils.universe import merge_universe
+
+
+def default_cache_dir() -> str:
+    # Per user rather than a shared temp dir, the file decides the asset every order is signed for
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "hyperliquid-meta")
+
+
+def _is_valid(meta: Any, spot_meta: Any) -> bool:
+    return (isinstance(meta, dict) and isinstance(meta.get("universe"), list)
+            and isinstance(spot_meta, dict) and isinstance(spot_meta.get("universe"), list)
+            and isinstance(spot_meta.get("tokens"), list))
+
+
+class MetaCache:
+    _shared: Dict[str, "MetaCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 cache_dir: Optional[str] = None,
+                 ttl: float = 300,
+                 logger=None):
+        """
+        Perp and spot metadata cache shared by HyperliquidInfo and Exchange instances.
+
+        The documents are kept in memory and in a JSON file under cache_dir,
+        so that every process on a host reuses the same fetch while it is
+        younger than ttl. The coin_to_asset and name_to_coin tables are owned
+        by the cache and handed out by reference, refreshes merge new assets
+        into them in place so every instance sees new listings.
+
+        Args:
+            base_url (str): Api url, defaults to mainnet.
+            cache_dir (str): Directory of the cache file, created private to the user, defaults to
+                hyperliquid-meta under $XDG_CACHE_HOME or ~/.cache.
+            ttl (float): Seconds before cached metadata is fetched again.
+        """
+        self.base_url = base_url or MAINNET_API_URL
+        self.cache_dir = cache_dir or default_cache_dir()
+        url_key = hashlib.sha1(self.base_url.encode()).hexdigest()[:16]
+        self.path = os.path.join(self.cache_dir, f"meta-{url_key}.json")
+        self.ttl = ttl
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.meta: Optional[Meta] = None
+        self.spot_meta: Optional[SpotMeta] = None
+        self.fetched_at = 0.0
+        self.coin_to_asset: Dict[str, int] = {}
+        self.name_to_coin: Dict[str, str] = {}
+
+        self._api = API(self.base_url)
+        self._lock = threading.Lock()
+        self._stop_refresh = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def shared(cls, base_url: Optional[str] = None, **kwargs) -> "MetaCache":
+        """
+        Return the process wide cache of base_url, creating it on first use.
+
+        Args:
+            base_url (str): Api url, defaults to mainnet.
+            **kwargs: Forwarded to the constructor when the cache is created.
+
+        Returns:
+            MetaCache: Cache shared by every caller of the same url
+        """
+        base_url = base_url or MAINNET_API_URL
+        with cls._shared_lock:
+            cache = cls._shared.get(base_url)
+            if cache is None:
+                cache = cls(base_url, **kwargs)
+                cls._shared[base_url] = cache
+            return cache
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        # A fetch time in the future comes from a planted or corrupt file, never trust it
+        return 0 <= time.time() - fetched_at < self.ttl
+
+    def _read_disk(self) -> Optional[dict]:
+        try:
+            with open(self.path) as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(document, dict) or document.get("base_url") != self.base_url:
+            return None
+        fetched_at = document.get("fetched_at")
+        if not isinstance(fetched_at, (int, float)) or not self._is_fresh(fetched_at):
+            return None
+        if not _is_valid(document.get("meta"), document.get("spot_meta")):
+            return None
+        return document
+
+    def _write_disk(self, meta: Meta, spot_meta: SpotMeta, fetched_at: float) -> None:
+        document = {
+            "base_url": self.base_url,
+            "fetched_at": fetched_at,
+            "meta": meta,
+            "spot_meta": spot_meta,
+        }
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            # Write next to the target and rename, readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".meta-", suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(document, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write metadata cache {self.path}: {e}")
+
+    def _store(self, meta: Meta, spot_meta: SpotMeta, fetched_at: float) -> int:
+        self.meta = meta
+        self.spot_meta = spot_meta
+        self.fetched_at = fetched_at
+        return merge_universe(self.coin_to_asset, self.name_to_coin, meta, spot_meta)
+
+    def _fetch(self) -> Tuple[Meta, SpotMeta, float]:
+        meta = self._api.post("/info", {"type": "meta"})
+        spot_meta = self._api.post("/info", {"type": "spotMeta"})
+        if not _is_valid(meta, spot_meta):
+            # e.g. {"error": ...} bodies, caching them would break every process on the host until the ttl
+            raise ValueError(f"Unexpected metadata response: {meta!r:.200} {spot_meta!r:.200}")
+        fetched_at = time.time()
+        self._write_disk(meta, spot_meta, fetched_at)
+        return meta, spot_meta, fetched_at
+
+    def load(self) -> Tuple[Meta, SpotMeta]:
+        """
+        Return the metadata, from memory, then disk, then the api.
+
+        Returns:
+            tuple: (meta, spot_meta)
+        """
+        with self._lock:
+            if self.meta is None or not self._is_fresh(self.fetched_at):
+                document = self._read_disk()
+                if document is not None:
+                    self._store(document["meta"], document["spot_meta"], document["fetched_at"])
+                else:
+                    self._store(*self._fetch())
+            return self.meta, self.spot_meta
+
+    def refresh(self) -> int:
+        """
+        Fetch the metadata from the api regardless of its age.
+
+        Returns:
+            int: Number of assets added to the lookup tables
+        """
+        meta, spot_meta, fetched_at = self._fetch()
+        with self._lock:
+            added = self._store(meta, spot_meta, fetched_at)
+        if added:
+            self.logger.info(f"Metadata refresh added {added} assets")
+        return added
+
+    def _refresh_loop(self, interval: float):
+        while not self._stop_refresh.wait(interval):
+            try:
+                # Another process may already have refreshed the file
+                document = self._read_disk()
+                if document is not None and document["fetched_at"] > self.fetched_at:
+                    with self._lock:
+                        self._store(document["meta"], document["spot_meta"], document["fetched_at"])
+                else:
+                    self.refresh()
+            except Exception as e:
+                self.logger.warning(f"Metadata refresh failed: {e}")
+
+    def start_background_refresh(self, interval: Optional[float] = None):
+        """
+        Refresh the metadata from a daemon thread.
+
+        Args:
+            interval (float): Seconds between refreshes, defaults to ttl.
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._stop_refresh.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, args=(interval or self.ttl,), daemon=True)
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self):
+        self._stop_refresh.set()
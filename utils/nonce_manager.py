@@ -0,0 +1,39 @@
+import threading
+import time
+
+from hyperliquid.utils.types import Dict, Optional
+
+
+class NonceManager():
+    def __init__(self):
+        """
+        Strictly increasing nonces for the actions signed by one wallet.
+
+        Each nonce is the current time in ms, or one more than the previous
+        nonce when several are taken within the same millisecond, so threads
+        and tasks signing concurrently never reuse a nonce. Bursts of more
+        than 1000 actions per second run ahead of the clock by the excess
+        only, well within the window of timestamps the exchange accepts.
+        """
+        self.last_nonce = 0
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        now = int(time.time() * 1000)
+        with self._lock:
+            self.last_nonce = max(now, self.last_nonce + 1)
+            return self.last_nonce
+
+
+_nonce_managers: Dict[str, NonceManager] = {}
+_nonce_managers_lock = threading.Lock()
+
+
+def get_nonce_manager(address: str) -> NonceManager:
+    """Process wide NonceManager of a signing address, shared by every Exchange signing with it."""
+    address = address.lower()
+    with _nonce_managers_lock:
+        manager: Optional[NonceManager] = _nonce_managers.get(address)
+        if manager is None:
+            manager = _nonce_managers[address] = NonceManager()
+        return manager
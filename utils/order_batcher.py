@@ -0,0 +1,262 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+from hyperliquid.utils.signing import order_request_to_order_wire
+from hyperliquid.utils.types import Any, Cloid, Dict, List, Optional, Tuple
+
+# Actions are sent in this order within a flush, cancels first to free margin for the orders that follow
+KINDS = ("cancel", "modify", "order")
+
+
+def _statuses(response: Any, count: int) -> List[Any]:
+    """One status per request of a merged action, an error for each if the action was rejected as a whole."""
+    if not isinstance(response, dict) or response.get("status") != "ok":
+        error = response.get("response") if isinstance(response, dict) else response
+        return [{"error": error}] * count
+    statuses = list(response.get("response", {}).get("data", {}).get("statuses", []))
+    return statuses + [{"error": "No status in response"}] * (count - len(statuses))
+
+
+class OrderBatcher():
+    def __init__(self,
+                 exchange,
+                 window: float = 0.002,
+                 max_batch: int = 50):
+        """
+        Merge order, cancel and modify calls from many callers into one action each.
+
+        Requests are collected for window seconds after the first one, or
+        until max_batch are pending, then sent as one order (bulk_orders),
+        one cancel (bulk_cancel) and one batchModify (bulk_modify_orders_new)
+        action, so N calls cost one signature and round trip per kind. Each
+        call returns a future resolved with its own status of the response,
+        e.g. {"resting": {"oid": ...}}, "success" or {"error": ...}.
+
+        Runs a flusher thread, use AsyncOrderBatcher with an AsyncExchange.
+
+        Args:
+            exchange (Exchange): Exchange the merged actions are sent with.
+            window (float): Seconds to wait for more requests after the first one.
+            max_batch (int): Pending requests that trigger an immediate flush.
+        """
+        self.exchange = exchange
+        self.window = window
+        self.max_batch = max_batch
+        self.batches_sent = 0
+        self.requests_sent = 0
+        self._pending: Dict[str, List[Tuple[Any, Any]]] = {kind: [] for kind in KINDS}
+        self._pending_count = 0
+        self._first_pending_at = 0.0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._init_flusher()
+
+    def _init_flusher(self):
+        self._thread = threading.Thread(target=self._run, name="hyperliquid-order-batcher", daemon=True)
+        self._thread.start()
+
+    def _new_future(self):
+        return concurrent.futures.Future()
+
+    def order(self,
+              name: str,
+              is_buy: bool,
+              sz: float,
+              limit_px: float,
+              order_type: Any,
+              reduce_only: bool = False,
+              cloid: Optional[Cloid] = None):
+        order = {
+            "coin": name,
+            "is_buy": is_buy,
+            "sz": sz,
+            "limit_px": limit_px,
+            "order_type": order_type,
+            "reduce_only": reduce_only,
+        }
+        if cloid:
+            order["cloid"] = cloid
+        return self._add("order", order)
+
+    def cancel(self, name: str, oid: int):
+        return self._add("cancel", {"coin": name, "oid": oid})
+
+    def modify(self,
+               oid: Any,
+               name: str,
+               is_buy: bool,
+               sz: float,
+               limit_px: float,
+               order_type: Any,
+               reduce_only: bool = False,
+               cloid: Optional[Cloid] = None):
+        modify = {
+            "oid": oid,
+            "order": {
+                "coin": name,
+                "is_buy": is_buy,
+                "sz": sz,
+                "limit_px": limit_px,
+                "order_type": order_type,
+                "reduce_only": reduce_only,
+                "cloid": cloid,
+            },
+        }
+        return self._add("modify", modify)
+
+    def _rejected(self, kind: str, request: Any, future: Any) -> bool:
+        """
+        Build the wire form of a request now, failing only its own future if it can not be.
+
+        An unknown coin (KeyError) or a size or price that does not round
+        (ValueError) would otherwise raise from the merged call and fail
+        every request of the batch.
+        """
+        info = self.exchange.info
+        try:
+            if kind == "order":
+                order_request_to_order_wire(request, info.name_to_asset(request["coin"]))
+            elif kind == "modify":
+                order_request_to_order_wire(request["order"], info.name_to_asset(request["order"]["coin"]))
+            else:
+                info.name_to_asset(request["coin"])
+        except Exception as e:
+            future.set_exception(e)
+            return True
+        return False
+
+    def _add(self, kind: str, request: Any):
+        future = self._new_future()
+        if self._rejected(kind, request, future):
+            return future
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("OrderBatcher is closed")
+            if self._pending_count == 0:
+                self._first_pending_at = time.monotonic()
+            self._pending[kind].append((request, future))
+            self._pending_count += 1
+            self._condition.notify()
+        return future
+
+    def _take(self) -> Dict[str, List[Tuple[Any, Any]]]:
+        batch = self._pending
+        self._pending = {kind: [] for kind in KINDS}
+        self._pending_count = 0
+        return batch
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending_count == 0 and not self._closed:
+                    self._condition.wait()
+                if self._pending_count == 0:
+                    return
+                deadline = self._first_pending_at + self.window
+                while self._pending_count < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._take()
+            for call, requests, futures in self._calls(batch):
+                try:
+                    response = call(requests)
+                except Exception as e:
+                    self._fail(futures, e)
+                else:
+                    self._resolve(futures, response)
+
+    def _calls(self, batch: Dict[str, List[Tuple[Any, Any]]]):
+        calls = {
+            "cancel": self.exchange.bulk_cancel,
+            "modify": self.exchange.bulk_modify_orders_new,
+            "order": self.exchange.bulk_orders,
+        }
+        for kind in KINDS:
+            entries = batch[kind]
+            if entries:
+                self.batches_sent += 1
+                self.requests_sent += len(entries)
+                yield calls[kind], [request for request, _ in entries], [future for _, future in entries]
+
+    @staticmethod
+    def _resolve(futures: List[Any], response: Any):
+        for future, status in zip(futures, _statuses(response, len(futures))):
+            if not future.done():
+                future.set_result(status)
+
+    @staticmethod
+    def _fail(futures: List[Any], exception: BaseException):
+        for future in futures:
+            if not future.done():
+                future.set_exception(exception)
+
+    def close(self):
+        """Send what is pending and stop the flusher."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+
+class AsyncOrderBatcher(OrderBatcher):
+    def __init__(self,
+                 exchange,
+                 window: float = 0.002,
+                 max_batch: int = 50):
+        """
+        OrderBatcher for an AsyncExchange, flushed by the running event loop instead of a thread.
+
+        Calls return asyncio futures, e.g. ``status = await batcher.order(...)``.
+        """
+        super().__init__(exchange, window, max_batch)
+
+    def _init_flusher(self):
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    def _new_future(self):
+        return asyncio.get_running_loop().create_future()
+
+    def _add(self, kind: str, request: Any):
+        if self._closed:
+            raise RuntimeError("OrderBatcher is closed")
+        future = self._new_future()
+        if self._rejected(kind, request, future):
+            return future
+        self._pending[kind].append((request, future))
+        self._pending_count += 1
+        if self._pending_count >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending_count == 0:
+            return
+        task = asyncio.ensure_future(self._send(self._take()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: Dict[str, List[Tuple[Any, Any]]]):
+        for call, requests, futures in self._calls(batch):
+            try:
+                response = await call(requests)
+            except Exception as e:
+                self._fail(futures, e)
+            else:
+                self._resolve(futures, response)
+
+    async def close(self):
+        """Send what is pending and wait for the responses."""
+        self._closed = True
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
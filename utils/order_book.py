@@ -0,0 +1,176 @@
+from array import array
+from bisect import bisect_left
+
+from hyperliquid.utils.types import Dict, L2BookData, L2BookMsg, L2Level, List, Optional, Side, Tuple
+
+
+class L2OrderBook:
+    def __init__(self, coin: str):
+        """
+        In-memory L2 book of a single coin.
+
+        Both sides are stored as parallel price/size/count arrays sorted by
+        ascending price, so the best bid is the last bid entry and the best
+        ask the first ask entry and top of book queries are O(1).
+
+        Args:
+            coin (str): Coin of the book.
+        """
+        self.coin = coin
+        self.bid_px = array("d")
+        self.bid_sz = array("d")
+        self.bid_n = array("q")
+        self.ask_px = array("d")
+        self.ask_sz = array("d")
+        self.ask_n = array("q")
+        self.time = 0
+        self.updates = 0
+
+    def _side(self, side: Side) -> Tuple[array, array, array]:
+        if side == "B":
+            return self.bid_px, self.bid_sz, self.bid_n
+        return self.ask_px, self.ask_sz, self.ask_n
+
+    def apply_snapshot(self, data: L2BookData):
+        """
+        Replace the whole book with an l2Book payload.
+
+        Args:
+            data (dict): l2Book data, levels are [bids best first, asks best first].
+        """
+        bids, asks = data["levels"]
+        # Bids arrive best (highest) first, reverse them into ascending order
+        self.bid_px = array("d", [float(level["px"]) for level in reversed(bids)])
+        self.bid_sz = array("d", [float(level["sz"]) for level in reversed(bids)])
+        self.bid_n = array("q", [level["n"] for level in reversed(bids)])
+        self.ask_px = array("d", [float(level["px"]) for level in asks])
+        self.ask_sz = array("d", [float(level["sz"]) for level in asks])
+        self.ask_n = array("q", [level["n"] for level in asks])
+        self.time = data["time"]
+        self.updates += 1
+
+    def apply_level(self, side: Side, px: float, sz: float, n: int = 0):
+        """
+        Set the size of one price level, a size of 0 removes the level.
+
+        Args:
+            side (str): "B" for bids, "A" for asks.
+            px (float): Level price.
+            sz (float): New total size at the level.
+            n (int): Number of orders at the level.
+        """
+        prices, sizes, counts = self._side(side)
+        index = bisect_left(prices, px)
+        exists = index < len(prices) and prices[index] == px
+        if sz == 0:
+            if exists:
+                del prices[index]
+                del sizes[index]
+                del counts[index]
+        elif exists:
+            sizes[index] = sz
+            counts[index] = n
+        else:
+            prices.insert(index, px)
+            sizes.insert(index, sz)
+            counts.insert(index, n)
+
+    def apply_diff(self, data: L2BookData):
+        """
+        Apply an l2Book payload whose levels only carry the changed levels.
+
+        Args:
+            data (dict): l2Book data, levels with sz "0" are removed.
+        """
+        bids, asks = data["levels"]
+        for level in bids:
+            self.apply_level("B", float(level["px"]), float(level["sz"]), level["n"])
+        for level in asks:
+            self.apply_level("A", float(level["px"]), float(level["sz"]), level["n"])
+        self.time = data["time"]
+        self.updates += 1
+
+    def best_bid(self) -> Optional[float]:
+        return self.bid_px[-1] if self.bid_px else None
+
+    def best_ask(self) -> Optional[float]:
+        return self.ask_px[0] if self.ask_px else None
+
+    def mid(self) -> Optional[float]:
+        if not self.bid_px or not self.ask_px:
+            return None
+        return (self.bid_px[-1] + self.ask_px[0]) / 2
+
+    def spread(self) -> Optional[float]:
+        if not self.bid_px or not self.ask_px:
+            return None
+        return self.ask_px[0] - self.bid_px[-1]
+
+    def depth_to_notional(self, side: Side, notional: float) -> Tuple[float, Optional[float]]:
+        """
+        Walk one side of the book from the top until notional is filled.
+
+        Args:
+            side (str): "B" to walk the bids (selling into them), "A" to walk the asks.
+            notional (float): Quote amount to fill.
+
+        Returns:
+            tuple: (size filled, average price), average price is None on an empty side
+        """
+        prices, sizes, _ = self._side(side)
+        if side == "B":
+            levels = range(len(prices) - 1, -1, -1)
+        else:
+            levels = range(len(prices))
+        filled_sz = 0.0
+        filled_notional = 0.0
+        for i in levels:
+            level_notional = prices[i] * sizes[i]
+            if filled_notional + level_notional >= notional:
+                filled_sz += (notional - filled_notional) / prices[i]
+                filled_notional = notional
+                break
+            filled_sz += sizes[i]
+            filled_notional += level_notional
+        if filled_sz == 0:
+            return 0.0, None
+        return filled_sz, filled_notional / filled_sz
+
+    def levels(self, side: Side) -> List[L2Level]:
+        """Levels of one side best first, in the l2Book wire format."""
+        prices, sizes, counts = self._side(side)
+        indexes = range(len(prices) - 1, -1, -1) if side == "B" else range(len(prices))
+        return [{"px": str(prices[i]), "sz": str(sizes[i]), "n": counts[i]} for i in indexes]
+
+
+class OrderBookManager:
+    def __init__(self, diff: bool = False):
+        """
+        L2 books keyed by coin, fed by l2Book websocket messages.
+
+        Use on_message as the subscription callback, e.g.
+        info.subscribe({"type": "l2Book", "coin": "ETH"}, books.on_message).
+
+        Args:
+            diff (bool): Treat incoming levels as diffs instead of full snapshots.
+        """
+        self.diff = diff
+        self.books: Dict[str, L2OrderBook] = {}
+
+    def book(self, coin: str) -> L2OrderBook:
+        book = self.books.get(coin)
+        if book is None:
+            book = self.books[coin] = L2OrderBook(coin)
+        return book
+
+    def apply(self, data: L2BookData) -> L2OrderBook:
+        book = self.book(data["coin"])
+        if self.diff:
+            book.apply_diff(data)
+        else:
+            book.apply_snapshot(data)
+        return book
+
+    def on_message(self, message: L2BookMsg):
+        if message.get("channel") == "l2Book":
+            self.apply(message["data"])
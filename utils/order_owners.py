@@ -0,0 +1,183 @@
+import threading
+from collections import OrderedDict, defaultdict
+
+from hyperliquid.utils.types import Any, Cloid, Dict, List, Optional, Set, Tuple, Union
+
+# Channels whose messages carry no user, see UserRouter
+USER_CHANNEL_TYPES = {"user": "userEvents", "orderUpdates": "orderUpdates"}
+
+
+def _cloid_key(cloid: Union[None, str, Cloid]) -> Optional[str]:
+    if cloid is None:
+        return None
+    return (cloid.to_raw() if isinstance(cloid, Cloid) else cloid).lower()
+
+
+class OrderOwnerRegistry():
+    def __init__(self, max_size: int = 100_000):
+        """
+        Which user an oid or cloid belongs to.
+
+        Filled by Exchange when it places orders (cloids before sending,
+        oids from the response) and by orderUpdates snapshots, read by the
+        websocket managers to route userEvents and orderUpdates of many users
+        sharing one connection. The oldest entries are evicted past max_size.
+
+        Args:
+            max_size (int): Maximum number of oids and of cloids remembered.
+        """
+        self.max_size = max_size
+        self._oids: "OrderedDict[int, str]" = OrderedDict()
+        self._cloids: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _put(table: OrderedDict, key: Any, user: str, max_size: int):
+        table[key] = user
+        table.move_to_end(key)
+        if len(table) > max_size:
+            table.popitem(last=False)
+
+    def register(self, user: str, oid: Optional[int] = None, cloid: Union[None, str, Cloid] = None):
+        user = user.lower()
+        cloid_key = _cloid_key(cloid)
+        with self._lock:
+            if oid is not None:
+                self._put(self._oids, oid, user, self.max_size)
+            if cloid_key is not None:
+                self._put(self._cloids, cloid_key, user, self.max_size)
+
+    def owner(self, oid: Optional[int] = None, cloid: Union[None, str, Cloid] = None) -> Optional[str]:
+        """
+        User of an order, looked up by oid then cloid. An oid found through its cloid is remembered.
+
+        Returns:
+            str: Lower case address, or None if the order is unknown
+        """
+        with self._lock:
+            user = self._oids.get(oid) if oid is not None else None
+            if user is None:
+                cloid_key = _cloid_key(cloid)
+                user = self._cloids.get(cloid_key) if cloid_key is not None else None
+                if user is not None and oid is not None:
+                    self._put(self._oids, oid, user, self.max_size)
+            return user
+
+    def register_order_response(self, user: str, cloids: List[Optional[Cloid]], response: Any):
+        """
+        Remember the oids of an order or batchModify response.
+
+        Args:
+            user (str): Address the orders were placed for.
+            cloids (list): Cloid of each order, in request order.
+            response (dict): /exchange response.
+        """
+        if not isinstance(response, dict) or response.get("status") != "ok":
+            return
+        statuses = response.get("response", {}).get("data", {}).get("statuses", [])
+        for cloid, status in zip(cloids, statuses):
+            if not isinstance(status, dict):
+                continue
+            placed = status.get("resting") or status.get("filled")
+            if placed is not None and "oid" in placed:
+                self.register(user, placed["oid"], cloid)
+
+
+_default_registry: Optional[OrderOwnerRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_default_registry() -> OrderOwnerRegistry:
+    """Process wide registry shared by every Exchange and websocket manager that is not given one."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = OrderOwnerRegistry()
+        return _default_registry
+
+
+class UserRouter():
+    def __init__(self, registry: Optional[OrderOwnerRegistry] = None):
+        """
+        Route userEvents and orderUpdates messages, which carry no user, to the subscribed users of a connection.
+
+        With one user per channel on the connection every message is theirs.
+        With several, orderUpdates, fills and nonUserCancel events are split
+        per owner of their oid/cloid and liquidations go to the liquidated
+        user. Parts whose owner is unknown, and funding events, can not be
+        attributed and are returned with a None identifier, which is why
+        WebsocketManager only shares a connection between users when
+        multiplex_users is set.
+
+        Args:
+            registry (OrderOwnerRegistry): Order owners, defaults to the process wide registry.
+        """
+        self.registry = registry or get_default_registry()
+        # Subscription type -> lower case users subscribed on the connection
+        self.users: Dict[str, Set[str]] = defaultdict(set)
+        self.unattributed = 0
+
+    def add(self, subscription_type: str, user: str):
+        self.users[subscription_type].add(user.lower())
+
+    def remove(self, subscription_type: str, user: str):
+        self.users[subscription_type].discard(user.lower())
+
+    def _learn(self, user: str, ws_msg: Any):
+        if ws_msg["channel"] == "orderUpdates":
+            for update in ws_msg["data"]:
+                order = update["order"]
+                self.registry.register(user, order["oid"], order.get("cloid"))
+
+    def split(self, ws_msg: Any) -> List[Tuple[Optional[str], Any]]:
+        """
+        Split a userEvents or orderUpdates message into per user messages.
+
+        Returns:
+            list: (identifier, message) pairs, each message carries its "user"
+        """
+        subscription_type = USER_CHANNEL_TYPES[ws_msg["channel"]]
+        users = self.users[subscription_type]
+        user = ws_msg.get("user")
+        if user is None and len(users) == 1:
+            user = next(iter(users))
+        if user is not None:
+            user = user.lower()
+            ws_msg["user"] = user
+            self._learn(user, ws_msg)
+            return [(f"{subscription_type}:{user}", ws_msg)]
+
+        if ws_msg["channel"] == "orderUpdates":
+            parts = self._group(ws_msg["data"], lambda update: update["order"], users)
+            return self._messages(ws_msg, parts, lambda updates: updates)
+
+        data = ws_msg["data"]
+        for key in ("fills", "nonUserCancel"):
+            if key in data:
+                parts = self._group(data[key], lambda item: item, users)
+                return self._messages(ws_msg, parts, lambda items, key=key: {key: items})
+        liquidated = ((data.get("liquidation") or {}).get("liquidated_user") or "").lower()
+        if liquidated in users:
+            return [(f"userEvents:{liquidated}", {"channel": "user", "data": data, "user": liquidated})]
+        self.unattributed += 1
+        return [(None, ws_msg)]
+
+    def _group(self, items: List[Any], order_of, users: Set[str]) -> Dict[Optional[str], List[Any]]:
+        parts: Dict[Optional[str], List[Any]] = defaultdict(list)
+        for item in items:
+            order = order_of(item)
+            owner = self.registry.owner(order.get("oid"), order.get("cloid"))
+            parts[owner if owner in users else None].append(item)
+        return parts
+
+    def _messages(self, ws_msg: Any, parts: Dict[Optional[str], List[Any]], wrap) -> List[Tuple[Optional[str], Any]]:
+        subscription_type = USER_CHANNEL_TYPES[ws_msg["channel"]]
+        messages = []
+        for owner, items in parts.items():
+            if owner is None:
+                self.unattributed += len(items)
+                messages.append((None, {"channel": ws_msg["channel"], "data": wrap(items)}))
+            else:
+                messages.append((f"{subscription_type}:{owner}",
+                                 {"channel": ws_msg["channel"], "data": wrap(items), "user": owner}))
+        return messages
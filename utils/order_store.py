@@ -0,0 +1,232 @@
+import bisect
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from hyperliquid.utils.types import Any, Cloid, Dict, Iterable, List, Optional, Set, Tuple, Union
+from utils.order_owners import _cloid_key
+
+OPEN_STATUSES = ("open", "triggered")
+
+
+class _PriceLevels():
+    def __init__(self):
+        # Sorted prices of the levels and the oids resting at each
+        self.prices: List[float] = []
+        self.oids: Dict[float, Set[int]] = {}
+
+    def add(self, price: float, oid: int):
+        oids = self.oids.get(price)
+        if oids is None:
+            oids = self.oids[price] = set()
+            bisect.insort(self.prices, price)
+        oids.add(oid)
+
+    def discard(self, price: float, oid: int):
+        oids = self.oids.get(price)
+        if oids is None:
+            return
+        oids.discard(oid)
+        if not oids:
+            del self.oids[price]
+            del self.prices[bisect.bisect_left(self.prices, price)]
+
+    def between(self, min_px: Optional[float], max_px: Optional[float]) -> Iterable[int]:
+        start = 0 if min_px is None else bisect.bisect_left(self.prices, min_px)
+        stop = len(self.prices) if max_px is None else bisect.bisect_right(self.prices, max_px)
+        for price in self.prices[start:stop]:
+            yield from self.oids[price]
+
+
+class OrderStore():
+    def __init__(self, max_closed: int = 10000):
+        """
+        Open orders of one user, by oid, with indexes by cloid, coin, side and price level.
+
+        Fed by orderUpdates (apply_order_updates, replace) and by Exchange
+        responses (apply_order_response, apply_cancel_response), so what is
+        resting can be answered locally, e.g. every bid on ETH above a price
+        is orders("ETH", "B", min_px=price), without scanning other coins or
+        levels. Orders are dicts with oid, coin, side ("B" or "A"), price,
+        size, orig_size, cloid and timestamp.
+
+        Args:
+            max_closed (int): Number of closed oids remembered, so a late order response does not resurrect an
+                order its updates already closed.
+        """
+        self.max_closed = max_closed
+        self.by_oid: Dict[int, Dict[str, Any]] = {}
+        self.by_cloid: Dict[str, int] = {}
+        self.by_coin: Dict[str, Set[int]] = defaultdict(set)
+        self.levels: Dict[Tuple[str, str], _PriceLevels] = defaultdict(_PriceLevels)
+        self._closed: "OrderedDict[int, None]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.by_oid)
+
+    def __contains__(self, oid: int) -> bool:
+        return oid in self.by_oid
+
+    def get(self, oid: Optional[int] = None, cloid: Union[None, str, Cloid] = None) -> Optional[Dict[str, Any]]:
+        """Open order by oid, or by cloid when no oid is given."""
+        if oid is None:
+            oid = self.by_cloid.get(_cloid_key(cloid))
+        return self.by_oid.get(oid)
+
+    def orders(self,
+               coin: Optional[str] = None,
+               side: Optional[str] = None,
+               min_px: Optional[float] = None,
+               max_px: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Open orders matching every given filter.
+
+        Args:
+            coin (str): Coin as in orderUpdates, e.g. "ETH" or "@107".
+            side (str): "B" for bids, "A" for asks.
+            min_px (float): Lowest limit price, inclusive.
+            max_px (float): Highest limit price, inclusive.
+
+        Returns:
+            list: Orders, by ascending price when coin and side are given
+        """
+        with self._lock:
+            if coin is not None and side is not None:
+                levels = self.levels.get((coin, side))
+                return [self.by_oid[oid] for oid in levels.between(min_px, max_px)] if levels is not None else []
+            oids: Iterable[int] = self.by_oid if coin is None else self.by_coin.get(coin, ())
+            return [order for order in (self.by_oid[oid] for oid in oids)
+                    if (side is None or order["side"] == side)
+                    and (min_px is None or order["price"] >= min_px)
+                    and (max_px is None or order["price"] <= max_px)]
+
+    def level(self, coin: str, side: str, price: float) -> List[Dict[str, Any]]:
+        """Open orders resting at exactly price."""
+        with self._lock:
+            levels = self.levels.get((coin, side))
+            oids = list(levels.oids.get(price, ())) if levels is not None else []
+            return [self.by_oid[oid] for oid in oids]
+
+    def upsert(self,
+               oid: int,
+               coin: str,
+               side: str,
+               price: float,
+               size: float,
+               cloid: Union[None, str, Cloid] = None,
+               orig_size: Optional[float] = None,
+               timestamp: Optional[int] = None) -> Dict[str, Any]:
+        with self._lock:
+            self.remove(oid, closed=False)
+            self._closed.pop(oid, None)
+            order = {
+                "oid": oid,
+                "coin": coin,
+                "side": side,
+                "price": price,
+                "size": size,
+                "orig_size": size if orig_size is None else orig_size,
+                "cloid": _cloid_key(cloid),
+                "timestamp": int(time.time() * 1000) if timestamp is None else timestamp,
+            }
+            self.by_oid[oid] = order
+            if order["cloid"] is not None:
+                self.by_cloid[order["cloid"]] = oid
+            self.by_coin[coin].add(oid)
+            self.levels[(coin, side)].add(price, oid)
+            return order
+
+    def remove(self, oid: int, closed: bool = True) -> Optional[Dict[str, Any]]:
+        """Remove an order, remembering it was closed unless closed is False."""
+        with self._lock:
+            if closed:
+                self._closed[oid] = None
+                if len(self._closed) > self.max_closed:
+                    self._closed.popitem(last=False)
+            order = self.by_oid.pop(oid, None)
+            if order is None:
+                return None
+            if order["cloid"] is not None and self.by_cloid.get(order["cloid"]) == oid:
+                del self.by_cloid[order["cloid"]]
+            coin_oids = self.by_coin[order["coin"]]
+            coin_oids.discard(oid)
+            if not coin_oids:
+                del self.by_coin[order["coin"]]
+            self.levels[(order["coin"], order["side"])].discard(order["price"], oid)
+            return order
+
+    def upsert_wire(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert an order as found in orderUpdates and frontend_open_orders."""
+        return self.upsert(order["oid"],
+                           order["coin"],
+                           order["side"],
+                           float(order["limitPx"]),
+                           float(order["sz"]),
+                           order.get("cloid"),
+                           float(order.get("origSz", order["sz"])),
+                           order.get("timestamp", 0))
+
+    def apply_order_updates(self, updates: List[Dict[str, Any]]):
+        """Apply orderUpdates entries: open and triggered orders rest, every other status closes the order."""
+        with self._lock:
+            for update in updates:
+                if update["status"] in OPEN_STATUSES:
+                    self.upsert_wire(update["order"])
+                else:
+                    self.remove(update["order"]["oid"])
+
+    def replace(self, orders: List[Dict[str, Any]]):
+        """Replace every order with a full list, as from frontend_open_orders."""
+        with self._lock:
+            for oid in list(self.by_oid):
+                self.remove(oid, closed=False)
+            for order in orders:
+                self.upsert_wire(order)
+
+    @staticmethod
+    def _statuses(response: Any) -> List[Any]:
+        if not isinstance(response, dict) or response.get("status") != "ok":
+            return []
+        return response.get("response", {}).get("data", {}).get("statuses", [])
+
+    def apply_order_response(self, orders: List[Dict[str, Any]], response: Any, replaced: Optional[List[Any]] = None):
+        """
+        Add the resting orders of an order or batchModify response.
+
+        Args:
+            orders (list): Orders in request order, dicts with coin (as in orderUpdates), is_buy, limit_px, sz and
+                optionally cloid.
+            response (dict): /exchange response.
+            replaced (list): For batchModify, the oid or cloid each order replaces.
+        """
+        statuses = self._statuses(response)
+        with self._lock:
+            for i, (order, status) in enumerate(zip(orders, statuses)):
+                placed = isinstance(status, dict) and ("resting" in status or "filled" in status)
+                if replaced is not None and placed:
+                    # A rejected modify leaves the original order resting
+                    target = replaced[i]
+                    old = self.get(cloid=target) if isinstance(target, (str, Cloid)) else self.get(target)
+                    if old is not None:
+                        self.remove(old["oid"])
+                resting = status.get("resting") if isinstance(status, dict) else None
+                if resting is None or resting["oid"] in self._closed:
+                    continue
+                self.upsert(resting["oid"],
+                            order["coin"],
+                            "B" if order["is_buy"] else "A",
+                            float(order["limit_px"]),
+                            float(order["sz"]),
+                            resting.get("cloid", order.get("cloid")))
+
+    def apply_cancel_response(self, targets: List[Union[int, str, Cloid]], response: Any):
+        """Remove the orders a cancel or cancelByCloid response reports canceled, targets are oids or cloids."""
+        statuses = self._statuses(response)
+        with self._lock:
+            for target, status in zip(targets, statuses):
+                if status != "success":
+                    continue
+                order = self.get(cloid=target) if isinstance(target, (str, Cloid)) else self.get(target)
+                if order is not None:
+                    self.remove(order["oid"])
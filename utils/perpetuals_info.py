@@ -1,23 +1,8 @@
-import aiohttp
 import asyncio
 
-class HyperPerpetualInfo:
-    def __init__(self):
-        self.headers = {
-            "Content-Type": "application/json",
-        }
+from utils.http_pool import HyperInfoClient, get_default_pool
 
-    async def _call(self, params):
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url = 'https://api.hyperliquid.xyz/info',
-                headers=self.headers,
-                json=params) as response:
-                if response.headers['Content-Type'] == 'application/json':
-                    return await response.json()
-                else:
-                    return await response.text()
-    
+class HyperPerpetualInfo(HyperInfoClient):
     async def get_metadata(self):
         """
         Retrieve perpetuals metadata
@@ -128,9 +113,11 @@ class HyperPerpetualInfo:
         return await self._call(params)
         
 async def main():
-    info = HyperPerpetualInfo()
-    metadata = await info.get_assets_at_OI_cap()
-    print(metadata)
+    async with HyperPerpetualInfo() as info:
+        metadata = await info.get_assets_at_OI_cap()
+        print(metadata)
+    # The clients share the process wide pool, close it once they are done
+    await get_default_pool().close()
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
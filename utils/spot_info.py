@@ -1,23 +1,8 @@
-import aiohttp
 import asyncio
 
-class HyperSpotInfo:
-    def __init__(self):
-        self.headers = {
-            "Content-Type": "application/json",
-        }
+from utils.http_pool import HyperInfoClient, get_default_pool
 
-    async def _call(self, params):
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url = 'https://api.hyperliquid.xyz/info',
-                headers=self.headers,
-                json=params) as response:
-                if response.headers['Content-Type'] == 'application/json':
-                    return await response.json()
-                else:
-                    return await response.text()
-    
+class HyperSpotInfo(HyperInfoClient):
     async def get_metadata(self):
         """
         Retrieve spot metadata
@@ -90,9 +75,11 @@ class HyperSpotInfo:
         return await self._call(params)
         
 async def main():
-    info = HyperSpotInfo()
-    metadata = await info.get_token_info("0xbaf265ef389da684513d98d68edf4eae")#"0x84A6d1E07517e21123E8FfF5b705333577C9FdF7")
-    print(metadata)
+    async with HyperSpotInfo() as info:
+        metadata = await info.get_token_info("0xbaf265ef389da684513d98d68edf4eae")#"0x84A6d1E07517e21123E8FfF5b705333577C9FdF7")
+        print(metadata)
+    # The clients share the process wide pool, close it once they are done
+    await get_default_pool().close()
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
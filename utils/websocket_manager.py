@@ -1,21 +1,81 @@
-import json
 import asyncio
+import concurrent.futures
+import inspect
+import random
 import threading
+import time
 import websockets
+import websockets.exceptions
 import logging
 from collections import defaultdict
 
+from hyperliquid.utils.json_codec import resolve_codec
 from hyperliquid.utils.types import Any, Callable, Dict, List, NamedTuple, Optional, Subscription, Tuple, WsMsg
+from utils.array_codec import ARRAY_CHANNELS, decode_ws_msg
+from utils.heartbeat import Heartbeat
+from utils.frame_peek import DATA_CHANNELS, SKIP_CHANNELS, peek_channel, peek_identifier, subscription_channel
+from utils.message_queue import BLOCK, BoundedMessageQueue
+from utils.order_owners import USER_CHANNEL_TYPES, UserRouter
+
+# Everything a dropped or unreachable connection can raise: closed sockets, failed handshakes, DNS and TCP errors
+TRANSPORT_ERRORS = (websockets.exceptions.WebSocketException, OSError, asyncio.TimeoutError, EOFError)
 
 ActiveSubscription = NamedTuple("ActiveSubscription", [("callback", Callable[[Any], None]), ("subscription_id", int)])
 
 
+def start_io_thread(run: Callable[[], Any], name: str) -> concurrent.futures.Future:
+    """
+    Run the coroutine returned by run on a new daemon thread with its own event loop.
+
+    Returns:
+        concurrent.futures.Future: Resolved with the coroutine's result once the thread's loop is done
+    """
+    done: concurrent.futures.Future = concurrent.futures.Future()
+
+    def target():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            done.set_result(loop.run_until_complete(run()))
+        except BaseException as e:
+            done.set_exception(e)
+        finally:
+            loop.close()
+
+    threading.Thread(target=target, name=name, daemon=True).start()
+    return done
+
+
+def dispatch_executor() -> concurrent.futures.ThreadPoolExecutor:
+    # A single worker keeps callbacks in order and never concurrent with each other
+    return concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="hyperliquid-ws-dispatch")
+
+
 class WebsocketManager():
     def __init__(self,
                  base_url,
                  logger=None,
-                 process_message_function=None):
+                 process_message_function=None,
+                 array_decoding=False,
+                 queue_maxsize=10000,
+                 queue_policies=None,
+                 codec=None,
+                 lazy_decoding=True,
+                 resync_function=None,
+                 retry_delay=1,
+                 max_retry_delay=60,
+                 heartbeat_interval=20,
+                 pong_timeout=None,
+                 stale_after=None,
+                 stale_action="reconnect",
+                 on_stale=None,
+                 subscription_batch_window=0.005,
+                 order_owners=None,
+                 multiplex_users=False):
         self.logger = logger or logging.getLogger(__name__)
+        self.base_url = base_url
+        # JSON codec used for every frame, see hyperliquid.utils.json_codec
+        self.codec = resolve_codec(codec)
         self.url = "ws" + base_url[len("http") :] + "/ws"
         self.stop_stream = False
         self.ws = None
@@ -23,52 +83,281 @@ class WebsocketManager():
         self.ws_ready = False
         self.queued_subscriptions: List[Tuple[Subscription, ActiveSubscription]] = []
         self.active_subscriptions: Dict[str, List[ActiveSubscription]] = defaultdict(list)
-        self.subscriptions = []
+        # Identifier -> subscription sent to the server, one per identifier however many callbacks share it
+        self.subscriptions: Dict[str, Subscription] = {}
+        # Subscribe/unsubscribe frames waiting to be flushed to the live socket, see _queue_change
+        self.subscription_batch_window = subscription_batch_window
+        self.subscription_frames_sent = 0
+        self._pending_changes: Dict[str, Tuple[str, Subscription]] = {}
+        self._flush_scheduled = False
+        self._subscriptions_lock = threading.Lock()
+        self._has_subscriptions: Optional[asyncio.Event] = None
+        # Splits userEvents and orderUpdates between the users subscribed on this connection, see utils.order_owners
+        self.user_router = UserRouter(order_owners)
+        # userEvents and orderUpdates carry no user, so unless multiplex_users is set every further user gets a
+        # connection of its own: with several users on one connection, updates of orders placed outside this process
+        # can not be attributed
+        self.multiplex_users = multiplex_users
+        self.user_connections: Dict[str, "WebsocketManager"] = {}
+        # Subscription id -> user connection it was delegated to
+        self._delegated: Dict[int, "WebsocketManager"] = {}
+        self._connection_options = dict(logger=logger, process_message_function=process_message_function,
+                                        array_decoding=array_decoding, queue_maxsize=queue_maxsize,
+                                        queue_policies=queue_policies, codec=codec, lazy_decoding=lazy_decoding,
+                                        resync_function=resync_function, retry_delay=retry_delay,
+                                        max_retry_delay=max_retry_delay, heartbeat_interval=heartbeat_interval,
+                                        pong_timeout=pong_timeout, stale_after=stale_after,
+                                        stale_action=stale_action, on_stale=on_stale,
+                                        subscription_batch_window=subscription_batch_window,
+                                        order_owners=order_owners, multiplex_users=True)
+        # Number of messages delivered per identifier, plus "unrouted" for the on_message fallback
+        self.route_counts: Dict[str, int] = defaultdict(int)
+        # Hand l2Book, trades and candle data to callbacks as NumPy structured arrays, see utils.array_codec
+        self.array_decoding = array_decoding
+        # Received messages wait here for the consumer, see utils.message_queue for the per channel policies
+        self.queue_maxsize = queue_maxsize
+        self.queue_policies = queue_policies
+        self.message_queue: Optional[BoundedMessageQueue] = None
+        # Peek at the channel (and coin) of raw frames and drop the ones no callback wants before decoding them
+        self.lazy_decoding = lazy_decoding
+        self.channel_refcounts: Dict[str, int] = defaultdict(int)
+        # Frames dropped undecoded per channel
+        self.skipped_counts: Dict[str, int] = defaultdict(int)
+        # Reconnects back off with full jitter between 0 and retry_delay * 2 ** attempt, capped at max_retry_delay
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.reconnects = 0
+        # Frames that could not be decoded, and decoded messages whose payload could not be routed, both skipped
+        self.decode_errors = 0
+        self.malformed_messages = 0
+        # Coroutine function (subscriptions, since_ms) -> websocket messages rebuilding state missed in an outage
+        self.resync_function = resync_function
+        self.last_message_ms: Optional[int] = None
+        # (last frame before the outage, reconnect) times in ms of every outage
+        self.gaps: List[Tuple[int, int]] = []
+        # Ping/pong latency and stale subscription watchdog, see utils.heartbeat
+        self.heartbeat = Heartbeat(heartbeat_interval, pong_timeout, stale_after, stale_action, on_stale, self.logger)
 
         if not process_message_function:
             self.on_message = self.process_message
         else:
             self.on_message = process_message_function
 
+        self.is_running = False
         self.loop = None
         self.thread = None
+        self.consumer_task = None
+        # Where decoded messages are dispatched when running on a dedicated thread, see start
+        self.dispatch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.executor: Optional[concurrent.futures.Executor] = None
+        self._worker_loops = threading.local()
 
     async def send_subscriptions(self):
-        for subscription in self.subscriptions:
-            await self.ws.send(
-                json.dumps({
-                    "method": "subscribe",
-                    "subscription": subscription
-                })
-            )
-            self.logger.info(f"Subscribed to {subscription}")
+        """Send every subscription without waiting for one to be written before queueing the next."""
+        with self._subscriptions_lock:
+            # The full set is sent now, changes queued before the connection was up are part of it
+            self._pending_changes.clear()
+            subscriptions = list(self.subscriptions.values())
+        await self._send_frames([("subscribe", subscription) for subscription in subscriptions])
+        self.logger.info(f"Subscribed to {len(subscriptions)} subscriptions")
+
+    async def _send_frames(self, changes: List[Tuple[str, Subscription]]):
+        messages = [self.codec.dumps({"method": method, "subscription": subscription}) for method, subscription in changes]
+        await asyncio.gather(*[self.ws.send(message) for message in messages])
+        self.subscription_frames_sent += len(messages)
+
+    def _queue_change(self, identifier: str, method: str, subscription: Subscription):
+        """
+        Queue a subscribe or unsubscribe frame for the live socket, the caller holds _subscriptions_lock.
+
+        Changes are flushed together subscription_batch_window seconds after
+        the first one. Hyperliquid has no frame carrying several
+        subscriptions, so a burst still costs one frame per identifier, but
+        they are written in one go and opposite changes of the same
+        identifier within the window cancel out.
+        """
+        pending = self._pending_changes.pop(identifier, None)
+        if pending is None or pending[0] == method:
+            self._pending_changes[identifier] = (method, subscription)
+        if self.ws is None or self.loop is None or self.loop.is_closed() or self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        self.loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self._flush_changes()))
+
+    async def _flush_changes(self):
+        await asyncio.sleep(self.subscription_batch_window)
+        with self._subscriptions_lock:
+            changes = list(self._pending_changes.values())
+            self._pending_changes.clear()
+            self._flush_scheduled = False
+        if not changes or self.ws is None or self.stop_stream:
+            # A reconnect sends the current subscriptions anyway, a closing connection needs none
+            return
+        try:
+            await self._send_frames(changes)
+        except TRANSPORT_ERRORS:
+            self.logger.warning(f"Could not send {len(changes)} subscription changes, they are replayed on reconnect")
+
+    def _notify_subscribed(self):
+        if self._has_subscriptions is not None:
+            self._has_subscriptions.set()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(max_retry_delay, retry_delay * 2 ** attempt)]."""
+        return random.uniform(0, min(self.max_retry_delay, self.retry_delay * 2 ** attempt))
+
+    async def resync(self, since_ms: int):
+        """
+        Queue the resync_function's REST snapshots ahead of the frames of the new connection.
+
+        Args:
+            since_ms (int): Time of the last frame received before the outage.
+        """
+        if self.resync_function is None or not self.subscriptions:
+            return
+        try:
+            messages = await self.resync_function(list(self.subscriptions.values()), since_ms)
+        except Exception:
+            self.logger.exception("Websocket resync failed")
+            return
+        for message in messages:
+            await self._put(message, self._identifier(message))
+
+    async def _put(self, data, identifier):
+        channel = data.get("channel")
+        if channel in USER_CHANNEL_TYPES:
+            try:
+                messages = self.user_router.split(data)
+            except (KeyError, TypeError, AttributeError, ValueError) as e:
+                self.malformed_messages += 1
+                self.logger.warning(f"Skipping malformed {channel} message ({e!r}): {data!r:.200}")
+                return
+            for user_identifier, user_data in messages:
+                if user_identifier is not None:
+                    self.heartbeat.on_message(user_identifier)
+                await self._enqueue(channel, user_data, user_identifier)
+            return
+        if identifier is not None:
+            self.heartbeat.on_message(identifier)
+            if self.array_decoding and channel in ARRAY_CHANNELS and self.active_subscriptions.get(identifier):
+                # Decoded on the I/O thread, the callbacks on the application loop or workers get the arrays
+                try:
+                    data = decode_ws_msg(data)
+                except (KeyError, TypeError, AttributeError, ValueError) as e:
+                    self.malformed_messages += 1
+                    self.logger.warning(f"Skipping malformed {channel} message ({e!r}): {data!r:.200}")
+                    return
+        await self._enqueue(channel, data, identifier)
+
+    async def _enqueue(self, channel, data, identifier):
+        if not (self.message_queue.full() and self.message_queue.policy(channel) == BLOCK):
+            await self.message_queue.put(channel, data, identifier)
+            return
+        # No frame is read while waiting for room, a slow consumer must not pass for a dead connection
+        self.heartbeat.pause()
+        try:
+            await self.message_queue.put(channel, data, identifier)
+        finally:
+            self.heartbeat.resume()
 
     async def run(self,
                   ping_interval=None,
-                  retry_delay=1):
+                  retry_delay=None):
+        if retry_delay is not None:
+            self.retry_delay = retry_delay
         self.is_running = True
-        self.message_queue = asyncio.Queue()
-        asyncio.create_task(self.get_message())
-        self.logger.info(f"{self.__class__.__name__}: Connecting to stream...")
+        self.loop = asyncio.get_running_loop()
+        self.message_queue = BoundedMessageQueue(self.queue_maxsize, self.queue_policies)
+        self.consumer_task = asyncio.create_task(self.get_message())
+        self._has_subscriptions = asyncio.Event()
+        for connection in list(self.user_connections.values()):
+            self._start_user_connection(connection)
+        attempt = 0
+        gap_start_ms = None
         while not self.stop_stream:
+            if not self.subscriptions:
+                # Connect once there is something to subscribe to, e.g. an idle connection of a pool
+                self._has_subscriptions.clear()
+                await self._has_subscriptions.wait()
+                continue
+            self.logger.info(f"{self.__class__.__name__}: Connecting to stream...")
             try:
                 async with websockets.connect(self.url,
                                                 ping_interval=ping_interval,
                                                 max_size=None) as ws:
                     self.ws = ws
                     await self.send_subscriptions()
+                    attempt = 0
                     self.logger.info(f"{self.__class__.__name__}: Connected to stream.")
-                    while not self.stop_stream:
-                        message = await ws.recv()
-                        data = json.loads(message)
-                        await self.message_queue.put(data)
-                
-            except websockets.exceptions.ConnectionClosedError as e:
+                    if gap_start_ms is not None:
+                        self.gaps.append((gap_start_ms, int(time.time() * 1000)))
+                        await self.resync(gap_start_ms)
+                        gap_start_ms = None
+                    self.heartbeat.on_connect()
+                    watchdog = asyncio.create_task(self._watch(ws))
+                    try:
+                        await self._receive(ws)
+                    finally:
+                        watchdog.cancel()
+
+            except TRANSPORT_ERRORS as e:
+                if self.stop_stream:
+                    break
+                self.ws = None
+                if gap_start_ms is None:
+                    gap_start_ms = self.last_message_ms or int(time.time() * 1000)
+                self.reconnects += 1
+                delay = self.backoff_delay(attempt)
+                attempt += 1
                 self.logger.warning(
-                    f"Connection closed, retrying in {retry_delay} seconds..."
+                    f"Websocket transport error ({e!r}), reconnecting in {delay:.2f} seconds..."
                 )
-                await asyncio.sleep(retry_delay)
-                retry_delay = min(retry_delay * 2, 60)
+                await asyncio.sleep(delay)
+
+    async def _receive(self, ws):
+        while not self.stop_stream:
+            message = await ws.recv()
+            self.last_message_ms = int(time.time() * 1000)
+            identifier = None
+            if self.lazy_decoding:
+                wanted, channel, identifier = self._peek(message)
+                if not wanted:
+                    if channel == "pong":
+                        self.heartbeat.on_pong()
+                    self.skipped_counts[channel] += 1
+                    continue
+            try:
+                data = self.codec.loads(message)
+            except ValueError as e:
+                self.decode_errors += 1
+                self.logger.warning(f"Skipping undecodable websocket frame ({e!r}): {message!r:.200}")
+                continue
+            if not isinstance(data, dict):
+                self.malformed_messages += 1
+                self.logger.warning(f"Skipping websocket frame that is not an object: {message!r:.200}")
+                continue
+            if identifier is None:
+                identifier = self._identifier(data)
+            if data.get("channel") == "pong":
+                self.heartbeat.on_pong()
+            await self._put(data, identifier)
+
+    async def _watch(self, ws):
+        """Close the connection, which makes run reconnect, once the heartbeat finds it unhealthy."""
+        try:
+            reason = await self.heartbeat.run(self._send_message, self.active_identifiers)
+        except TRANSPORT_ERRORS:
+            return
+        if not self.stop_stream:
+            self.logger.warning(f"Forcing websocket reconnect: {reason}")
+            await ws.close()
+
+    def active_identifiers(self) -> List[str]:
+        return [identifier for identifier, active in self.active_subscriptions.items() if active]
+
+    def heartbeat_metrics(self) -> Dict[str, Any]:
+        """Ping/pong counts and latency, and stale subscription reports of the connection."""
+        return self.heartbeat.metrics()
 
     def subscription_to_identifier(self,
                                    subscription: Subscription) -> str:
@@ -79,13 +368,13 @@ class WebsocketManager():
         elif subscription["type"] == "trades":
             return f'trades:{subscription["coin"].lower()}'
         elif subscription["type"] == "userEvents":
-            return "userEvents"
+            return f'userEvents:{subscription["user"].lower()}'
         elif subscription["type"] == "userFills":
             return f'userFills:{subscription["user"].lower()}'
         elif subscription["type"] == "candle":
             return f'candle:{subscription["coin"].lower()},{subscription["interval"]}'
         elif subscription["type"] == "orderUpdates":
-            return "orderUpdates"
+            return f'orderUpdates:{subscription["user"].lower()}'
         elif subscription["type"] == "userFundings":
             return f'userFundings:{subscription["user"].lower()}'
         elif subscription["type"] == "userNonFundingLedgerUpdates":
@@ -93,39 +382,311 @@ class WebsocketManager():
         elif subscription["type"] == "webData2":
             return f'webData2:{subscription["user"].lower()}'
     
+    def ws_msg_to_identifier(self,
+                             ws_msg: WsMsg) -> Optional[str]:
+        """
+        Compute the routing identifier of an incoming message, matching subscription_to_identifier.
+
+        Args:
+            ws_msg (dict): Decoded websocket message.
+
+        Returns:
+            str: Identifier, or None if the message does not belong to a subscription
+        """
+        channel = ws_msg.get("channel")
+        if channel == "allMids":
+            return "allMids"
+        elif channel == "l2Book":
+            return f'l2Book:{ws_msg["data"]["coin"].lower()}'
+        elif channel == "trades":
+            trades = ws_msg["data"]
+            if len(trades) == 0:
+                return None
+            return f'trades:{trades[0]["coin"].lower()}'
+        elif channel == "user" or channel == "orderUpdates":
+            # Only messages built locally (resync) carry the user, live ones are split by user_router
+            user = ws_msg.get("user")
+            return f"{USER_CHANNEL_TYPES[channel]}:{user.lower()}" if user else None
+        elif channel == "userFills":
+            return f'userFills:{ws_msg["data"]["user"].lower()}'
+        elif channel == "candle":
+            return f'candle:{ws_msg["data"]["s"].lower()},{ws_msg["data"]["i"]}'
+        elif channel == "userFundings":
+            return f'userFundings:{ws_msg["data"]["user"].lower()}'
+        elif channel == "userNonFundingLedgerUpdates":
+            return f'userNonFundingLedgerUpdates:{ws_msg["data"]["user"].lower()}'
+        elif channel == "webData2":
+            return f'webData2:{ws_msg["data"]["user"].lower()}'
+        return None
+
+    def _identifier(self, ws_msg: WsMsg) -> Optional[str]:
+        try:
+            return self.ws_msg_to_identifier(ws_msg)
+        except (KeyError, TypeError, AttributeError, IndexError):
+            return None
+
+    def _peek(self, message) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Decide from the raw frame whether it is worth decoding.
+
+        Control frames (pong, subscription responses), frames that are not a
+        JSON object (e.g. the plain-text greeting) and data for channels or
+        coins without a subscription are not wanted. Other frames that can
+        not be peeked are always decoded.
+
+        Args:
+            message (str): Raw frame.
+
+        Returns:
+            tuple: (wanted, channel, identifier), identifier is None when it can only be read after decoding
+        """
+        channel = peek_channel(message)
+        if channel is None:
+            return message.lstrip()[:1] in ("{", b"{"), None, None
+        if channel in SKIP_CHANNELS:
+            return False, channel, None
+        if channel not in DATA_CHANNELS:
+            return True, channel, None
+        if not self.channel_refcounts.get(channel):
+            return False, channel, None
+        identifier = peek_identifier(message, channel)
+        if identifier is not None and not self.active_subscriptions.get(identifier):
+            return False, channel, identifier
+        return True, channel, identifier
+
+    def queue_metrics(self) -> Dict[str, Any]:
+        """Depth, high water mark, dropped and coalesced counts per channel of the message queue."""
+        if self.message_queue is None:
+            return {}
+        return self.message_queue.metrics()
+
     def subscribe(
         self, subscription: Subscription, callback: Callable[[Any], None], subscription_id: Optional[int] = None
     ) -> int:
+        """
+        Add a callback, subscribing on the live connection if it is the first one for the identifier.
+
+        Can be called from any thread, before or while the manager runs.
+
+        Returns:
+            int: Subscription id to pass to unsubscribe
+        """
         self.logger.debug("subscribing")
         identifier = self.subscription_to_identifier(subscription)
-        if identifier == "userEvents" or identifier == "orderUpdates":
-            # TODO: ideally the userEvent and orderUpdates messages would include the user so that we can multiplex
-            if len(self.active_subscriptions[identifier]) != 0:
-                raise NotImplementedError(f"Cannot subscribe to {identifier} multiple times")
-        self.active_subscriptions[identifier].append(ActiveSubscription(callback, subscription_id))
-        self.subscriptions.append(subscription)
-        
-    
+        with self._subscriptions_lock:
+            if subscription_id is None:
+                self.subscription_id_counter += 1
+                subscription_id = self.subscription_id_counter
+            connection = None
+            if subscription["type"] == "userEvents" or subscription["type"] == "orderUpdates":
+                connection = self._user_connection(subscription["user"])
+                if connection is None:
+                    self.user_router.add(subscription["type"], subscription["user"])
+                else:
+                    self._delegated[subscription_id] = connection
+            if connection is None:
+                # Copy on write, the receive loop may be iterating the current list on another thread
+                active = self.active_subscriptions.get(identifier) or []
+                self.active_subscriptions[identifier] = active + [ActiveSubscription(callback, subscription_id)]
+                self.channel_refcounts[subscription_channel(subscription["type"])] += 1
+                if identifier not in self.subscriptions:
+                    self.subscriptions[identifier] = subscription
+                    self._queue_change(identifier, "subscribe", subscription)
+        if connection is not None:
+            return connection.subscribe(subscription, callback, subscription_id)
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._notify_subscribed)
+        return subscription_id
+
+    def _user_connection(self, user: str) -> Optional["WebsocketManager"]:
+        """
+        Connection of its own for a user whose userEvents/orderUpdates can not share this one, the caller holds
+        _subscriptions_lock.
+
+        Returns:
+            WebsocketManager: None if the user's subscription goes on this connection
+        """
+        if self.multiplex_users:
+            return None
+        user = user.lower()
+        users = set().union(*self.user_router.users.values())
+        if not users or user in users:
+            return None
+        connection = self.user_connections.get(user)
+        if connection is None:
+            connection = self.user_connections[user] = WebsocketManager(self.base_url, **self._connection_options)
+            if self.loop is not None and not self.loop.is_closed() and self.is_running:
+                self.loop.call_soon_threadsafe(self._start_user_connection, connection)
+        return connection
+
+    def _start_user_connection(self, connection: "WebsocketManager"):
+        connection.set_handoff(self.dispatch_loop, self.executor)
+        asyncio.ensure_future(connection.run()).add_done_callback(self._user_connection_done)
+
+    def _user_connection_done(self, task: asyncio.Future):
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"User websocket connection failed: {task.exception()!r}")
+
+    def unsubscribe(self, subscription: Subscription, subscription_id: int) -> bool:
+        """
+        Remove a callback, unsubscribing on the live connection once no callback is left for the identifier.
+
+        Returns:
+            bool: False if no callback with subscription_id was subscribed to subscription
+        """
+        with self._subscriptions_lock:
+            connection = self._delegated.get(subscription_id)
+        if connection is not None:
+            if not connection.unsubscribe(subscription, subscription_id):
+                return False
+            with self._subscriptions_lock:
+                del self._delegated[subscription_id]
+                idle = connection not in self._delegated.values()
+                if idle:
+                    # Idle sockets of past users would count against the server's connection limit
+                    for user, user_connection in list(self.user_connections.items()):
+                        if user_connection is connection:
+                            del self.user_connections[user]
+            if idle:
+                connection.stop()
+            return True
+        identifier = self.subscription_to_identifier(subscription)
+        with self._subscriptions_lock:
+            active = self.active_subscriptions.get(identifier) or []
+            remaining = [
+                active_subscription for active_subscription in active
+                if active_subscription.subscription_id != subscription_id
+            ]
+            if len(remaining) == len(active):
+                return False
+            self.channel_refcounts[subscription_channel(subscription["type"])] -= 1
+            if remaining:
+                self.active_subscriptions[identifier] = remaining
+                return True
+            del self.active_subscriptions[identifier]
+            if subscription["type"] == "userEvents" or subscription["type"] == "orderUpdates":
+                self.user_router.remove(subscription["type"], subscription["user"])
+            self._queue_change(identifier, "unsubscribe", self.subscriptions.pop(identifier))
+        return True
+
     async def _send_message(self, message):
         if self.ws:
-            await self.ws.send(json.dumps(message))
+            await self.ws.send(self.codec.dumps(message))
 
     async def process_message(self, data):
         print(data)
 
-    def _run_loop(self):
-        """Creates and runs an asyncio event loop in a separate thread."""
-        self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
-        self.loop.run_until_complete(self.run())
+    def stop(self):
+        """Stop the stream, can be called from any thread."""
+        self.stop_stream = True
+        self.is_running = False
+        for connection in list(self.user_connections.values()):
+            connection.stop()
+        if self.loop is None or self.loop.is_closed():
+            return
 
-    def start(self):
-        """Starts the event loop in a separate thread to avoid blocking."""
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
+        def close():
+            self._notify_subscribed()
+            if self.consumer_task is not None:
+                self.consumer_task.cancel()
+            if self.ws is not None:
+                asyncio.ensure_future(self.ws.close())
+
+        self.loop.call_soon_threadsafe(close)
+
+    def set_handoff(self,
+                    dispatch_loop: Optional[asyncio.AbstractEventLoop] = None,
+                    executor: Optional[concurrent.futures.Executor] = None):
+        """
+        Choose where callbacks run when the manager has its own I/O thread.
+
+        Args:
+            dispatch_loop (AbstractEventLoop): Application loop the callbacks are scheduled on.
+            executor (Executor): Worker pool the callbacks are run on, used when dispatch_loop is None.
+        """
+        self.dispatch_loop = dispatch_loop
+        self.executor = executor
+
+    def start(self,
+              dispatch_loop: Optional[asyncio.AbstractEventLoop] = None,
+              executor: Optional[concurrent.futures.Executor] = None) -> concurrent.futures.Future:
+        """
+        Run socket I/O and decoding on a dedicated thread with its own event loop.
+
+        Decoded messages are handed to dispatch_loop, or to executor, so slow
+        callbacks only fill the message queue and never delay reading frames.
+        Without either, callbacks run in order on a private single worker
+        thread.
+
+        Args:
+            dispatch_loop (AbstractEventLoop): Application loop the callbacks are scheduled on.
+            executor (Executor): Worker pool the callbacks are run on.
+
+        Returns:
+            concurrent.futures.Future: Resolved when the stream stops
+        """
+        owned_executor = None
+        if dispatch_loop is None and executor is None:
+            executor = owned_executor = dispatch_executor()
+        self.set_handoff(dispatch_loop, executor)
+        done = start_io_thread(self.run, "hyperliquid-ws")
+        if owned_executor is not None:
+            done.add_done_callback(lambda _: owned_executor.shutdown(wait=False))
+        return done
+
+    def _route(self, data, identifier=None) -> Tuple[List[Callable[[Any], Any]], Any]:
+        if identifier is None:
+            identifier = self._identifier(data)
+        active_subscriptions = self.active_subscriptions.get(identifier) if identifier is not None else None
+        if not active_subscriptions:
+            self.route_counts["unrouted"] += 1
+            return [self.on_message], data
+        self.route_counts[identifier] += 1
+        return [active_subscription.callback for active_subscription in active_subscriptions], data
+
+    async def dispatch(self, data, identifier=None):
+        """
+        Call the callbacks subscribed to the message's identifier.
+
+        Messages that match no subscription (pong, subscription
+        acknowledgements, ...) go to the on_message fallback. Callbacks may be
+        plain functions or coroutine functions.
+
+        Args:
+            data (dict): Decoded websocket message.
+            identifier (str): Routing identifier if already known.
+        """
+        callbacks, data = self._route(data, identifier)
+        for callback in callbacks:
+            result = callback(data)
+            if inspect.isawaitable(result):
+                await result
+
+    def dispatch_blocking(self, data, identifier=None):
+        """dispatch for worker threads, coroutine callbacks run to completion on a loop private to the thread."""
+        callbacks, data = self._route(data, identifier)
+        for callback in callbacks:
+            result = callback(data)
+            if inspect.isawaitable(result):
+                loop = getattr(self._worker_loops, "loop", None)
+                if loop is None:
+                    loop = self._worker_loops.loop = asyncio.new_event_loop()
+                loop.run_until_complete(result)
+
+    async def _handoff(self, data, identifier):
+        if self.dispatch_loop is not None:
+            future = asyncio.run_coroutine_threadsafe(self.dispatch(data, identifier), self.dispatch_loop)
+            await asyncio.wrap_future(future)
+        elif self.executor is not None:
+            await self.loop.run_in_executor(self.executor, self.dispatch_blocking, data, identifier)
+        else:
+            await self.dispatch(data, identifier)
 
     async def get_message(self):
         while self.is_running:
-            data = await self.message_queue.get()
-            await self.on_message(data)
+            identifier, data = await self.message_queue.get()
+            try:
+                await self._handoff(data, identifier)
+            except Exception:
+                self.logger.exception("Error in websocket message callback")
 
@@ -0,0 +1,133 @@
+import asyncio
+import concurrent.futures
+import logging
+import zlib
+from collections import defaultdict
+
+from hyperliquid.utils.types import Any, Callable, Dict, List, Optional, Subscription, Union
+from utils.websocket_manager import WebsocketManager, dispatch_executor, start_io_thread
+
+ShardPolicy = Union[str, Callable[[Subscription, int], int]]
+
+
+class WebsocketPoolManager():
+    def __init__(self,
+                 base_url,
+                 connections: int = 4,
+                 policy: ShardPolicy = "coin_hash",
+                 logger=None,
+                 process_message_function=None,
+                 array_decoding=False,
+                 **manager_options):
+        """
+        Spread subscriptions over several websocket connections.
+
+        Each connection is a WebsocketManager with its own receive loop and
+        reconnect logic, so a dropped socket only affects its own share of
+        the subscriptions. Exposes the same subscribe/run/stop surface as
+        WebsocketManager.
+
+        Args:
+            base_url (str): Api url.
+            connections (int): Number of websocket connections.
+            policy (str | callable): How subscriptions are assigned to connections:
+                "coin_hash" hashes the coin (or user for user channels),
+                "channel" hashes the subscription type so each channel gets its own connection,
+                a callable receives (subscription, connections) and returns a connection index.
+            process_message_function (callable): Fallback for messages that match no subscription.
+            array_decoding (bool): Decode l2Book, trades and candle data to NumPy arrays.
+            manager_options: Passed to every WebsocketManager, e.g. queue_maxsize, queue_policies or codec.
+        """
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
+        self.logger = logger or logging.getLogger(__name__)
+        self.policy = policy
+        self.managers: List[WebsocketManager] = [
+            WebsocketManager(base_url,
+                             logger=self.logger,
+                             process_message_function=process_message_function,
+                             array_decoding=array_decoding,
+                             **manager_options)
+            for _ in range(connections)
+        ]
+        # Identifier -> index of the connection carrying it
+        self.assignments: Dict[str, int] = {}
+
+    def shard_for(self,
+                  subscription: Subscription) -> int:
+        """
+        Connection index a subscription is assigned to by the policy.
+
+        Args:
+            subscription (dict): Subscription.
+
+        Returns:
+            int: Index into managers
+        """
+        connections = len(self.managers)
+        if callable(self.policy):
+            return self.policy(subscription, connections) % connections
+        if self.policy == "coin_hash":
+            key = subscription.get("coin") or subscription.get("user") or subscription["type"]
+        elif self.policy == "channel":
+            key = subscription["type"]
+        else:
+            raise ValueError(f"Unknown shard policy {self.policy}")
+        # crc32 rather than hash() so that the assignment is stable across processes
+        return zlib.crc32(key.lower().encode()) % connections
+
+    def manager_for(self,
+                    subscription: Subscription) -> WebsocketManager:
+        identifier = self.managers[0].subscription_to_identifier(subscription)
+        if identifier not in self.assignments:
+            self.assignments[identifier] = self.shard_for(subscription)
+        return self.managers[self.assignments[identifier]]
+
+    def subscribe(
+        self, subscription: Subscription, callback: Callable[[Any], None], subscription_id: Optional[int] = None
+    ) -> int:
+        return self.manager_for(subscription).subscribe(subscription, callback, subscription_id)
+
+    def unsubscribe(self, subscription: Subscription, subscription_id: int) -> bool:
+        return self.manager_for(subscription).unsubscribe(subscription, subscription_id)
+
+    async def run(self, **kwargs):
+        """Run every connection until stopped, connections without subscriptions connect once they get one."""
+        await asyncio.gather(*[manager.run(**kwargs) for manager in self.managers])
+
+    def start(self,
+              dispatch_loop: Optional[asyncio.AbstractEventLoop] = None,
+              executor: Optional[concurrent.futures.Executor] = None) -> concurrent.futures.Future:
+        """
+        Run every connection on one dedicated I/O thread, see WebsocketManager.start.
+
+        Without dispatch_loop or executor the connections share a single
+        worker thread, so callbacks never run concurrently.
+        """
+        owned_executor = None
+        if dispatch_loop is None and executor is None:
+            executor = owned_executor = dispatch_executor()
+        for manager in self.managers:
+            manager.set_handoff(dispatch_loop, executor)
+        done = start_io_thread(self.run, "hyperliquid-ws-pool")
+        if owned_executor is not None:
+            done.add_done_callback(lambda _: owned_executor.shutdown(wait=False))
+        return done
+
+    def stop(self):
+        for manager in self.managers:
+            manager.stop()
+
+    def queue_metrics(self) -> List[Dict[str, Any]]:
+        return [manager.queue_metrics() for manager in self.managers]
+
+    def heartbeat_metrics(self) -> List[Dict[str, Any]]:
+        return [manager.heartbeat_metrics() for manager in self.managers]
+
+    @property
+    def route_counts(self) -> Dict[str, int]:
+        route_counts: Dict[str, int] = defaultdict(int)
+        for manager in self.managers:
+            for identifier, count in manager.route_counts.items():
+                route_counts[identifier] += count
+        return route_counts